@@ -0,0 +1 @@
+"""Benchmarks for the EnOcean integration, run them from the repository root."""
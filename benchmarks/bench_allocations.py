@@ -0,0 +1,64 @@
+"""Memory allocated per received telegram, RadioPacket against Telegram.
+
+Each variant turns the same radio frame into the object handed to the
+entities and decodes it the way the entities do. tracemalloc reports the
+memory held by one object and the peak while decoding it.
+
+    python -m benchmarks.bench_allocations -n 10000
+"""
+import argparse
+import tracemalloc
+
+from enocean.protocol.packet import RadioPacket
+from enocean.utils import to_bitarray
+
+from custom_enocean.esp3 import ESP3Framer
+from custom_enocean.telegram import Telegram
+
+from .fake_dongle import sample_frame
+
+
+def radio_packet(frame):
+    """Build and decode like before: RadioPacket and a list of bools."""
+    packet = RadioPacket(frame.packet_type, list(frame.data), list(frame.optional))
+    to_bitarray(packet.data)
+    return packet
+
+
+def telegram(frame):
+    """Build and decode a Telegram, the payload as one int."""
+    result = Telegram.from_frame(frame)
+    result.value  # pylint: disable=pointless-statement
+    return result
+
+
+def _measure(name, build, frame, count):
+    """Print the retained and the peak bytes per telegram."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    kept = [build(frame) for _ in range(count)]
+    retained = (tracemalloc.get_traced_memory()[0] - start) / count
+    tracemalloc.reset_peak()
+    current, _ = tracemalloc.get_traced_memory()
+    build(frame)
+    peak = tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    del kept
+    print(f"{name:12s} {retained:8.0f} B kept {peak:8.0f} B peak")
+    return retained
+
+
+def main():
+    """Measure both variants."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    frame = next(ESP3Framer().feed(sample_frame()))
+    before = _measure("RadioPacket", radio_packet, frame, args.count)
+    after = _measure("Telegram", telegram, frame, args.count)
+    print(f"reduction    {1 - after / before:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
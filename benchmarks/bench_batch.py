@@ -0,0 +1,49 @@
+"""Throughput of the per-telegram and the NumPy batch decoders.
+
+Random multisensor payloads are decoded both ways, the results are
+compared before the rates are printed.
+
+    python -m benchmarks.bench_batch -n 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from custom_enocean.batch import decode_batch
+from custom_enocean.eep import MULTISENSOR_DATA_FIELDS
+
+
+def main():
+    """Decode the same payloads both ways."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    layout = MULTISENSOR_DATA_FIELDS
+    payloads = np.random.default_rng(0).integers(
+        0, 256, (args.count, layout.length), dtype=np.uint8
+    )
+
+    start = time.perf_counter()
+    data = payloads.tobytes()
+    length = layout.length
+    rows = [
+        layout.decode(data[offset : offset + length])
+        for offset in range(0, len(data), length)
+    ]
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = decode_batch(layout, payloads)
+    batch = time.perf_counter() - start
+
+    for name, column in columns.items():
+        assert column.tolist() == [row[name] for row in rows], name
+    print(f"single   {args.count / single:12.0f} telegrams/s")
+    print(f"batch    {args.count / batch:12.0f} telegrams/s")
+    print(f"speedup  {single / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
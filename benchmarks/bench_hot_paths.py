@@ -0,0 +1,168 @@
+"""Micro benchmarks of the decode, dispatch and encode hot paths.
+
+Runs offline against a stubbed hass. Results are written as JSON and can
+be compared to a baseline, the run fails if a benchmark got slower than
+the threshold allows.
+
+    python -m benchmarks.bench_hot_paths --save baseline.json
+    python -m benchmarks.bench_hot_paths --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+import timeit
+
+from custom_enocean.climate import CLIMATE_DESC_THERMOSTAT, EnOceanThermostatSensor
+from custom_enocean.const import TRANSPORT_ASYNCIO
+from custom_enocean.dongle import EnOceanDongle, async_register_entity
+from custom_enocean.eep import THERMOSTAT_DATA_FIELDS
+from custom_enocean.esp3 import ESP3Framer, build_frame
+from custom_enocean.sensor import EnOceanMultiSensor
+from custom_enocean.telegram import Telegram
+
+SENDER = [0x05, 0x12, 0x34, 0x56]
+OPTIONAL = [0x03, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00]
+DISPATCH_SIZES = (10, 100, 1000)
+
+
+def pack_fields(rorg, length, fields):
+    """Return rorg followed by length bytes holding (value, offset, size) fields.
+
+    Offsets count from the first bit after the rorg byte, MSB first.
+    """
+    value = 0
+    for field, offset, size in fields:
+        value |= field << (length * 8 - offset - size)
+    return [rorg, *value.to_bytes(length, "big")]
+
+
+# D2 multisensor: 21.5 °C, 45 %, 300 lx, acceleration status 1, x/y/z 0.0/0.5/-1.0 g
+MULTISENSOR_DATA = pack_fields(
+    0xD2,
+    9,
+    [(615, 0, 10), (90, 10, 8), (300, 18, 17), (1, 35, 2), (500, 37, 10), (600, 47, 10), (300, 57, 9)],
+) + SENDER + [0x00]
+
+# A5-20-06: valve 50 %, set point 21 °C, 22 °C, harvesting, charge level ok, data telegram
+THERMOSTAT_DATA = [0xA5, 0x32, 0xAA, 0x2C, 0x68] + SENDER + [0x00]
+
+
+class StubHass:
+    """The parts of hass used by the hot paths, jobs run synchronously."""
+
+    def __init__(self):
+        self.data = {}
+        self.loop = None
+
+    def add_job(self, target, *args):
+        target(*args)
+
+    def async_add_job(self, target, *args):
+        target(*args)
+
+
+class StubEntity:
+    """Counts the packets routed to it."""
+
+    def __init__(self):
+        self.received = 0
+
+    def _message_received_callback(self, packet):
+        self.received += 1
+
+
+def bench_decode_multisensor():
+    sensor = EnOceanMultiSensor(SENDER, "bench", "")
+    data = bytes(MULTISENSOR_DATA)
+    return lambda: sensor.handle_data_telegram(Telegram(data).payload)
+
+
+def bench_decode_thermostat():
+    thermostat = EnOceanThermostatSensor(SENDER, "bench", False, CLIMATE_DESC_THERMOSTAT)
+    thermostat.send_response = lambda *args: None
+    data = bytes(THERMOSTAT_DATA)
+    return lambda: thermostat.handle_data_telegram(
+        THERMOSTAT_DATA_FIELDS.decode(Telegram(data).payload)
+    )
+
+
+def bench_encode_thermostat():
+    thermostat = EnOceanThermostatSensor(SENDER, "bench", False, CLIMATE_DESC_THERMOSTAT)
+    thermostat.send_command = lambda **kwargs: None
+    return thermostat.send_response
+
+
+def bench_dispatch(size):
+    hass = StubHass()
+    dongle = EnOceanDongle(hass, "/dev/null", TRANSPORT_ASYNCIO)
+    for sender in range(size - 1):
+        async_register_entity(hass, sender, StubEntity())
+    async_register_entity(hass, int.from_bytes(bytes(SENDER), "big"), StubEntity())
+    frame = next(ESP3Framer().feed(build_frame(0x01, MULTISENSOR_DATA, OPTIONAL)))
+    return lambda: dongle._async_dispatch_frame(frame)
+
+
+def benchmarks():
+    """Return the benchmarks by name."""
+    benches = {
+        "decode_multisensor": bench_decode_multisensor,
+        "decode_thermostat": bench_decode_thermostat,
+        "encode_thermostat": bench_encode_thermostat,
+    }
+    for size in DISPATCH_SIZES:
+        benches[f"dispatch_{size}"] = lambda size=size: bench_dispatch(size)
+    return benches
+
+
+def run(number, repeat):
+    """Return the best time per call in microseconds of every benchmark."""
+    results = {}
+    for name, setup in benchmarks().items():
+        timings = timeit.Timer(setup()).repeat(repeat=repeat, number=number)
+        results[name] = min(timings) / number * 1e6
+        print(f"{name:20s} {results[name]:10.2f} us")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks that are slower than baseline * (1 + threshold)."""
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        change = value / baseline[name] - 1
+        print(f"{name:20s} {change:+8.1%}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """Run the benchmarks and check them against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown against the baseline (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print("regressions: " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Parse throughput of python-enocean's Packet.parse_msg and the ESP3 framer.
+
+The same stream of radio frames is fed in chunks of the size a serial read
+typically returns.
+
+    python -m benchmarks.bench_parser -n 20000
+"""
+import argparse
+import time
+
+from enocean.protocol.constants import PARSE_RESULT
+from enocean.protocol.packet import Packet
+
+from custom_enocean.esp3 import ESP3Framer
+
+from .fake_dongle import sample_frame
+
+CHUNK_SIZE = 64
+
+
+def parse_enocean(chunks):
+    """Parse like the SerialCommunicator of python-enocean."""
+    buffer = []
+    frames = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while buffer:
+            result, buffer, packet = Packet.parse_msg(buffer)
+            if result == PARSE_RESULT.INCOMPLETE:
+                break
+            if result == PARSE_RESULT.OK and packet:
+                frames += 1
+    return frames
+
+
+def parse_esp3(chunks):
+    """Parse with the ESP3 framer of the integration."""
+    framer = ESP3Framer()
+    frames = 0
+    for chunk in chunks:
+        for _ in framer.feed(chunk):
+            frames += 1
+    return frames
+
+
+def _run(name, parser, chunks, expected):
+    start = time.perf_counter()
+    frames = parser(chunks)
+    elapsed = time.perf_counter() - start
+    assert frames == expected, f"{name} parsed {frames} of {expected} frames"
+    print(f"{name:8s} {frames / elapsed:12.0f} frames/s")
+    return elapsed
+
+
+def main():
+    """Run both parsers."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    stream = sample_frame() * args.count
+    chunks = [stream[i : i + CHUNK_SIZE] for i in range(0, len(stream), CHUNK_SIZE)]
+
+    enocean = _run("enocean", parse_enocean, chunks, args.count)
+    esp3 = _run("esp3", parse_esp3, chunks, args.count)
+    print(f"speedup  {enocean / esp3:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
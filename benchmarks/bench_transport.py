@@ -0,0 +1,93 @@
+"""Packet latency of the threaded and the asyncio transport.
+
+Every frame is written to a pty backed fake dongle and the time until the
+transport hands the parsed packet over is measured, one frame at a time.
+
+    python -m benchmarks.bench_transport -n 500
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+from enocean.communicators import SerialCommunicator
+import serial_asyncio
+
+from custom_enocean.dongle import EnOceanProtocol
+
+from .fake_dongle import FakeDongle, sample_frame
+
+
+def _summary(name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:8s} n={len(latencies)} "
+        f"median={statistics.median(latencies) * 1000:.3f}ms "
+        f"p99={p99 * 1000:.3f}ms max={latencies[-1] * 1000:.3f}ms"
+    )
+
+
+def bench_thread(count):
+    """Latency through python-enocean's SerialCommunicator thread."""
+    dongle = FakeDongle()
+    received = threading.Event()
+    communicator = SerialCommunicator(
+        port=dongle.path, callback=lambda packet: received.set()
+    )
+    communicator.start()
+    frame = sample_frame()
+    latencies = []
+    try:
+        for _ in range(count):
+            received.clear()
+            start = time.perf_counter()
+            dongle.send(frame)
+            received.wait(5)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        communicator.stop()
+        communicator.join()
+        dongle.close()
+    return latencies
+
+
+async def bench_asyncio(count):
+    """Latency through EnOceanProtocol on the event loop."""
+    loop = asyncio.get_running_loop()
+    dongle = FakeDongle()
+    waiter = None
+
+    def frame_received(frame, received_at):
+        waiter.set_result(time.perf_counter())
+
+    transport, _ = await serial_asyncio.create_serial_connection(
+        loop, lambda: EnOceanProtocol(frame_received), dongle.path, baudrate=57600
+    )
+    frame = sample_frame()
+    latencies = []
+    try:
+        for _ in range(count):
+            waiter = loop.create_future()
+            start = time.perf_counter()
+            dongle.send(frame)
+            latencies.append(await asyncio.wait_for(waiter, 5) - start)
+    finally:
+        transport.close()
+        dongle.close()
+    return latencies
+
+
+def main():
+    """Run both benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, default=200)
+    args = parser.parse_args()
+
+    _summary("thread", bench_thread(args.count))
+    _summary("asyncio", asyncio.run(bench_asyncio(args.count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""A fake EnOcean dongle backed by a pseudo terminal."""
+import os
+import tty
+
+from enocean.protocol.packet import Packet
+
+# F6-02 telegram from the binary_sensor docstring, -64 dBm
+SAMPLE_DATA = [0xF6, 0x10, 0xFE, 0xEA, 0x0D, 0xC9, 0x20]
+SAMPLE_OPTIONAL = [0x03, 0xFF, 0xFF, 0xFF, 0xFF, 0x40, 0x00]
+
+
+def sample_frame(data=None, optional=None) -> bytes:
+    """Return a complete ESP3 radio frame."""
+    packet = Packet(
+        0x01,
+        data=list(data or SAMPLE_DATA),
+        optional=list(optional or SAMPLE_OPTIONAL),
+    )
+    return bytes(packet.build())
+
+
+class FakeDongle:
+    """Pty pair, the slave side is opened like the serial port of a dongle."""
+
+    def __init__(self):
+        """Open the pty pair."""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+
+    def send(self, frame: bytes):
+        """Write a frame as if the dongle received it over the air."""
+        os.write(self._master, frame)
+
+    def read(self, size=4096) -> bytes:
+        """Read what the integration wrote to the dongle."""
+        return os.read(self._master, size)
+
+    def close(self):
+        """Close both ends."""
+        os.close(self._master)
+        os.close(self._slave)
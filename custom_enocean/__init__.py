@@ -1,18 +1,59 @@
 """Support for EnOcean devices."""
+import serial
 import voluptuous as vol
 
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
-from homeassistant.const import CONF_DEVICE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICE, Platform
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DATA_ENOCEAN, DOMAIN, ENOCEAN_DONGLE
+from .const import (
+    ATTR_DEVICE,
+    ATTR_PATH,
+    ATTR_SPEED,
+    CONF_STATE_WRITE_INTERVAL,
+    CONF_TRANSPORT,
+    DATA_ENOCEAN,
+    DEFAULT_CAPTURE_FILE,
+    DOMAIN,
+    ENOCEAN_COALESCER,
+    ENOCEAN_DISCOVERED,
+    ENOCEAN_RECEIVERS,
+    LOGGER,
+    SERVICE_DUMP_LATENCY,
+    SERVICE_REPLAY_CAPTURE,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+    TRANSPORT_THREAD,
+    TRANSPORTS,
+)
+from .device import StateWriteCoalescer
+from .discovery import DiscoveredDevices
 from .dongle import EnOceanDongle
 
+# platforms with entities of the dongle and of the discovered devices
+ENTRY_PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.CLIMATE]
+# senders listed per counter by the dump_latency service
+DUMP_SENDERS = 10
+
 CONFIG_SCHEMA = vol.Schema(
-    {DOMAIN: vol.Schema({vol.Required(CONF_DEVICE): cv.string})}, extra=vol.ALLOW_EXTRA
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Required(CONF_DEVICE): cv.string,
+                vol.Optional(CONF_TRANSPORT, default=TRANSPORT_THREAD): vol.In(
+                    TRANSPORTS
+                ),
+                vol.Optional(CONF_STATE_WRITE_INTERVAL, default=0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
 )
 
 
@@ -22,15 +63,16 @@ CONFIG_SCHEMA = vol.Schema(
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     """Set up the EnOcean component."""
+    # before the platforms, their entities use it
+    hass.data.setdefault(DATA_ENOCEAN, {})[ENOCEAN_COALESCER] = StateWriteCoalescer(
+        hass, config.get(DOMAIN, {}).get(CONF_STATE_WRITE_INTERVAL, 0)
+    )
+
     # support for text-based configuration (legacy)
     if DOMAIN not in config:
         return True
 
-    if hass.config_entries.async_entries(DOMAIN):
-        # We can only have one dongle. If there is already one in the config,
-        # there is no need to import the yaml based config.
-        return True
-
+    # the import flow aborts if the dongle is already configured
     hass.async_create_task(
         hass.config_entries.flow.async_init(
             DOMAIN, context={"source": SOURCE_IMPORT}, data=config[DOMAIN]
@@ -44,18 +86,156 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     """Set up an EnOcean dongle for the given entry."""
 
     enocean_data = hass.data.setdefault(DATA_ENOCEAN, {})
-    usb_dongle = EnOceanDongle(hass, config_entry.data[CONF_DEVICE])
-    await usb_dongle.async_setup()
-    enocean_data[ENOCEAN_DONGLE] = usb_dongle
+    if ENOCEAN_DISCOVERED not in enocean_data:
+        discovered = DiscoveredDevices(hass)
+        await discovered.async_load()
+        enocean_data[ENOCEAN_DISCOVERED] = discovered
+
+    # set in the options flow, or in the yaml (imported into the data)
+    transport = config_entry.options.get(
+        CONF_TRANSPORT, config_entry.data.get(CONF_TRANSPORT, TRANSPORT_THREAD)
+    )
+    usb_dongle = EnOceanDongle(hass, config_entry.data[CONF_DEVICE], transport)
+    # adds itself to the receiver group
+    try:
+        await usb_dongle.async_setup()
+    except serial.SerialException as exception:
+        raise ConfigEntryNotReady(
+            f"Cannot open EnOcean dongle {usb_dongle.serial_path}"
+        ) from exception
+    if not hass.services.has_service(DOMAIN, SERVICE_START_CAPTURE):
+        async_register_services(hass)
+    await hass.config_entries.async_forward_entry_setups(config_entry, ENTRY_PLATFORMS)
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reopen the dongle with changed options."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the capture and replay services of the dongles.
+
+    They act on the dongle given by its serial path, the first one by default.
+    """
+
+    def get_dongle(call: ServiceCall) -> EnOceanDongle:
+        dongles = hass.data[DATA_ENOCEAN][ENOCEAN_RECEIVERS].dongles
+        if ATTR_DEVICE not in call.data:
+            return next(iter(dongles.values()))
+        if call.data[ATTR_DEVICE] not in dongles:
+            raise HomeAssistantError(f"Unknown EnOcean dongle {call.data[ATTR_DEVICE]}")
+        return dongles[call.data[ATTR_DEVICE]]
+
+    def get_path(call: ServiceCall, usb_dongle: EnOceanDongle) -> str:
+        if ATTR_PATH in call.data:
+            return call.data[ATTR_PATH]
+        return hass.config.path(DEFAULT_CAPTURE_FILE.format(usb_dongle.identifier))
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        usb_dongle = get_dongle(call)
+        await usb_dongle.async_start_capture(get_path(call, usb_dongle))
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        await get_dongle(call).async_stop_capture()
+
+    async def async_replay_capture(call: ServiceCall) -> None:
+        usb_dongle = get_dongle(call)
+        await usb_dongle.async_replay(get_path(call, usb_dongle), call.data[ATTR_SPEED])
+
+    async def async_dump_latency(call: ServiceCall) -> None:
+        receivers = hass.data[DATA_ENOCEAN][ENOCEAN_RECEIVERS]
+        for usb_dongle in receivers.dongles.values():
+            LOGGER.info(
+                "Latency of %s (ms): %s", usb_dongle.identifier, usb_dongle.latency.as_dict()
+            )
+            LOGGER.info(
+                "Transmit queue of %s: %s",
+                usb_dongle.identifier,
+                usb_dongle.transmit_queue.as_dict(),
+            )
+            LOGGER.info(
+                "Telegrams of unknown senders on %s: %s, most by: %s",
+                usb_dongle.identifier,
+                usb_dongle.unmatched_senders.total(),
+                _top_senders(usb_dongle.unmatched_senders),
+            )
+        suppressed = receivers.duplicate_filter.suppressed
+        LOGGER.info(
+            "Suppressed copies: %s, most by: %s",
+            suppressed.total(),
+            _top_senders(suppressed),
+        )
+        coalescer = hass.data[DATA_ENOCEAN][ENOCEAN_COALESCER]
+        LOGGER.info(
+            "State writes: %s requested, %s written, %s saved",
+            coalescer.requested,
+            coalescer.written,
+            coalescer.saved,
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        async_start_capture,
+        vol.Schema(
+            {vol.Optional(ATTR_DEVICE): cv.string, vol.Optional(ATTR_PATH): cv.string}
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        async_stop_capture,
+        vol.Schema({vol.Optional(ATTR_DEVICE): cv.string}),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_CAPTURE,
+        async_replay_capture,
+        vol.Schema(
+            {
+                vol.Optional(ATTR_DEVICE): cv.string,
+                vol.Optional(ATTR_PATH): cv.string,
+                # 0 replays as fast as possible
+                vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        ),
+    )
+    hass.services.async_register(DOMAIN, SERVICE_DUMP_LATENCY, async_dump_latency)
+
+
+def _top_senders(counter) -> dict:
+    """Return the senders counted most often, by hex sender id."""
+    return {
+        f"{sender_int:08X}": count
+        for sender_int, count in counter.most_common(DUMP_SENDERS)
+    }
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload ENOcean config entry."""
 
-    enocean_dongle = hass.data[DATA_ENOCEAN][ENOCEAN_DONGLE]
+    if not await hass.config_entries.async_unload_platforms(
+        config_entry, ENTRY_PLATFORMS
+    ):
+        return False
+
+    # keep the routing table, the yaml platforms are not unloaded with the entry
+    receivers = hass.data[DATA_ENOCEAN][ENOCEAN_RECEIVERS]
+    enocean_dongle = receivers.dongles[config_entry.data[CONF_DEVICE]]
     enocean_dongle.unload()
-    hass.data.pop(DATA_ENOCEAN)
+    if not receivers.dongles:
+        for service in (
+            SERVICE_START_CAPTURE,
+            SERVICE_STOP_CAPTURE,
+            SERVICE_REPLAY_CAPTURE,
+            SERVICE_DUMP_LATENCY,
+        ):
+            hass.services.async_remove(DOMAIN, service)
 
     return True
@@ -0,0 +1,76 @@
+"""Min, max and mean of sensor values over fixed time windows."""
+from time import monotonic
+
+STAT_MIN = "min"
+STAT_MAX = "max"
+STAT_MEAN = "mean"
+STATS = (STAT_MIN, STAT_MAX, STAT_MEAN)
+
+
+class _Window:
+    """Running statistics of one field, O(1) per sample."""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def result(self):
+        return {
+            STAT_MIN: self.minimum,
+            STAT_MAX: self.maximum,
+            STAT_MEAN: self.total / self.count,
+        }
+
+
+class WindowAggregator:
+    """Aggregate samples over tumbling windows of window seconds.
+
+    A window is closed by the first sample after its end, there is no
+    timer. Samples are dicts of field name to value, only the given
+    fields are aggregated.
+
+    >>> aggregator = WindowAggregator(60, ["temperature"])
+    >>> aggregator.add({"temperature": 20.0}, now=0)
+    >>> aggregator.add({"temperature": 22.0}, now=30)
+    >>> aggregator.add({"temperature": 25.0}, now=61)
+    {'temperature': {'min': 20.0, 'max': 22.0, 'mean': 21.0}}
+    """
+
+    def __init__(self, window: float, fields):
+        """Initialize the aggregator."""
+        self.window = window
+        self.fields = tuple(fields)
+        self._windows = {field: _Window() for field in self.fields}
+        self._ends_at = None
+
+    def add(self, values, now=None):
+        """Add a sample, return the statistics of a window it closed, else None."""
+        if now is None:
+            now = monotonic()
+        result = None
+        if self._ends_at is None:
+            self._ends_at = now + self.window
+        elif now >= self._ends_at:
+            result = {
+                field: window.result()
+                for field, window in self._windows.items()
+                if window.count
+            }
+            self._windows = {field: _Window() for field in self.fields}
+            # windows without samples are skipped
+            self._ends_at += ((now - self._ends_at) // self.window + 1) * self.window
+        for field, window in self._windows.items():
+            window.add(values[field])
+        return result
@@ -0,0 +1,84 @@
+"""Batch decoding of stored telegrams with NumPy.
+
+Decodes whole archives (e.g. from a capture) column by column with the
+bit field layouts of the platforms, for reports and fault analysis.
+NumPy is imported on first use, the integration does not need it.
+"""
+from .bitfields import BitFields
+from .esp3 import HEADER_LENGTH, PACKET_TYPE_RADIO_ERP1
+
+
+def decode_batch(layout: BitFields, payloads):
+    """Return the fields of N payloads as column arrays by name.
+
+    payloads is an N x length uint8 array (anything numpy.asarray takes),
+    columns after the layout are ignored. The columns hold the same values
+    as layout.decode of every row: int64, float64 or bool.
+
+    >>> import numpy as np
+    >>> from .bitfields import Field
+    >>> layout = BitFields(4, [
+    ...     Field("valve_position", 0, 8),
+    ...     Field("temperature", 16, 8, 0.5),
+    ...     Field("window_open", 27, 1, flag=True),
+    ... ])
+    >>> payloads = np.array([[0x32, 0xAA, 0x2C, 0x68], [0x00, 0x80, 0x29, 0x78]], np.uint8)
+    >>> columns = decode_batch(layout, payloads)
+    >>> columns["valve_position"].tolist(), columns["temperature"].tolist()
+    ([50, 0], [22.0, 20.5])
+    >>> columns["window_open"].tolist()
+    [False, True]
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    payloads = np.asarray(payloads, dtype=np.uint8)
+    if payloads.ndim != 2 or payloads.shape[1] < layout.length:
+        raise ValueError(
+            f"expected an N x {layout.length} array, got {payloads.shape}"
+        )
+
+    eight = np.uint64(8)
+    columns = {}
+    for field in layout.fields:
+        # the bytes holding the field, joined into one uint64 per row
+        first = field.offset // 8
+        last = (field.offset + field.size - 1) // 8
+        value = payloads[:, first].astype(np.uint64)
+        for index in range(first + 1, last + 1):
+            value = (value << eight) | payloads[:, index]
+        shift = np.uint64((last + 1) * 8 - field.offset - field.size)
+        raw = (value >> shift) & np.uint64((1 << field.size) - 1)
+        if field.flag:
+            columns[field.name] = raw.astype(bool)
+        elif field.scale == 1 and field.bias == 0:
+            columns[field.name] = raw.astype(np.int64)
+        else:
+            # same float operations as the per-telegram decoder
+            columns[field.name] = raw.astype(np.float64) * field.scale + field.bias
+    return columns
+
+
+def capture_payloads(reader, sender_int, rorg, length):
+    """Return timestamps and the N x length payload array of a sender.
+
+    Collects the radio telegrams of one sender with the given rorg from a
+    CaptureReader, shorter telegrams are skipped. Blocking I/O.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    timestamps = []
+    payloads = bytearray()
+    for timestamp, frame in reader.frames(sender=sender_int):
+        if frame[4] != PACKET_TYPE_RADIO_ERP1:
+            continue
+        data_length = int.from_bytes(frame[1:3], "big")
+        data = frame[HEADER_LENGTH : HEADER_LENGTH + data_length]
+        # rorg, payload, sender id (4), status
+        if data[0] != rorg or len(data) - 6 < length:
+            continue
+        timestamps.append(timestamp)
+        payloads += data[1 : 1 + length]
+    return (
+        np.array(timestamps, dtype=np.uint64),
+        np.frombuffer(bytes(payloads), dtype=np.uint8).reshape(-1, length),
+    )
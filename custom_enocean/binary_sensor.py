@@ -5,39 +5,61 @@ from enocean.utils import combine_hex
 import voluptuous as vol
 
 import logging
+from time import perf_counter
 
 from homeassistant.components.binary_sensor import (
     DEVICE_CLASSES_SCHEMA,
     PLATFORM_SCHEMA,
     BinarySensorEntity,
 )
-from homeassistant.const import CONF_DEVICE_CLASS, CONF_ID, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    CONF_DEVICE,
+    CONF_DEVICE_CLASS,
+    CONF_ID,
+    CONF_NAME,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_platform
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from .const import (
+    ATTR_IS_OPEN,
+    CONF_EEP,
+    DATA_ENOCEAN,
+    ENOCEAN_DISCOVERED,
+    EVENT_ROCKER,
+    SERVICE_SET_STATE,
+    SIGNAL_DEVICE_DISCOVERED,
+)
 from .device import EnOceanEntity
+from .eep import RORG_RPS, get_profile, validate_eep
+from .rocker import RockerStateMachine, decode_rocker
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "EnOcean binary sensor"
 DEPENDENCIES = ["enocean"]
-EVENT_BUTTON_PRESSED = "button_pressed"
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_ID): vol.All(cv.ensure_list, [vol.Coerce(int)]),
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Optional(CONF_DEVICE_CLASS): DEVICE_CLASSES_SCHEMA,
+        # any profile of the registry, instead of a rocker switch
+        vol.Optional(CONF_EEP): validate_eep,
     }
 )
 
 
-def setup_platform(
+async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
-    add_entities: AddEntitiesCallback,
+    async_add_entities: AddEntitiesCallback,
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the Binary Sensor platform for EnOcean."""
@@ -46,7 +68,68 @@ def setup_platform(
     device_class = config.get(CONF_DEVICE_CLASS)
     _LOGGER.debug("setting up enocean instance with id %s", dev_id)
 
-    add_entities([EnOceanBinarySensor(dev_id, dev_name, device_class)])
+    if CONF_EEP in config:
+        async_add_entities(create_eep_binary_sensors(dev_id, dev_name, config[CONF_EEP]))
+    else:
+        async_add_entities([EnOceanBinarySensor(dev_id, dev_name, device_class)])
+    async_register_services()
+
+
+@callback
+def async_register_services():
+    """Register the binary sensor services on the current platform."""
+    platform = entity_platform.async_get_current_platform()
+
+    platform.async_register_entity_service(
+        SERVICE_SET_STATE,
+        {
+            vol.Required(ATTR_IS_OPEN): cv.boolean,
+            # only the targeted sensors of this device class
+            vol.Optional(ATTR_DEVICE_CLASS): DEVICE_CLASSES_SCHEMA,
+        },
+        "async_set_state",
+    )
+
+
+def create_eep_binary_sensors(dev_id, dev_name, eep):
+    """Return the binary sensors of a profile of the EEP registry."""
+    if (profile := get_profile(eep)) is None:
+        return []
+    return [
+        EnOceanEEPBinarySensor(dev_id, dev_name, profile, description)
+        for description in profile.binary_sensors
+    ]
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensors of the discovered devices of a dongle."""
+    serial_path = config_entry.data[CONF_DEVICE]
+    discovered = hass.data[DATA_ENOCEAN][ENOCEAN_DISCOVERED]
+
+    entities = []
+    for device in discovered.for_dongle(serial_path):
+        entities.extend(
+            create_eep_binary_sensors(device.dev_id, device.name, device.eep)
+        )
+    async_add_entities(entities)
+    async_register_services()
+
+    @callback
+    def async_device_discovered(device):
+        if device.dongle == serial_path and (
+            entities := create_eep_binary_sensors(
+                device.dev_id, device.name, device.eep
+            )
+        ):
+            async_add_entities(entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_DISCOVERED, async_device_discovered)
+    )
 
 
 class EnOceanBinarySensor(EnOceanEntity, BinarySensorEntity):
@@ -55,6 +138,9 @@ class EnOceanBinarySensor(EnOceanEntity, BinarySensorEntity):
     Supported EEPs (EnOcean Equipment Profiles):
     - F6-02-01 (Light and Blind Control - Application Style 2)
     - F6-02-02 (Light and Blind Control - Application Style 1)
+
+    Button actions are fired as custom_enocean_rocker_<sender>_<channel>
+    events, see rocker.py.
     """
     _attr_should_poll = False
 
@@ -64,6 +150,7 @@ class EnOceanBinarySensor(EnOceanEntity, BinarySensorEntity):
         self._device_class = device_class
         self._is_open = True
         self._attr_unique_id = f"{combine_hex(dev_id)}-{device_class}"
+        self._rocker = RockerStateMachine()
 
     @property
     def name(self):
@@ -80,6 +167,19 @@ class EnOceanBinarySensor(EnOceanEntity, BinarySensorEntity):
         """Return true if sensor state is on."""
         return bool(self._is_open)
 
+    @callback
+    def async_set_state(self, is_open: bool, device_class: str | None = None):
+        """Set the state in memory, e.g. after an outage.
+
+        The write goes through the coalescer, the states of all sensors
+        targeted by one service call are flushed together.
+        """
+        if device_class is not None and device_class != self._device_class:
+            return
+        if is_open == self._is_open:
+            return
+        self._is_open = is_open
+        self.async_schedule_update_ha_state()
 
     def value_changed(self, packet):
         """Fire an event with the data that have changed.
@@ -93,10 +193,65 @@ class EnOceanBinarySensor(EnOceanEntity, BinarySensorEntity):
             ['0xf6', '0x10', '0xfe', '0xea', '0xd', '0xc9', '0x20'] / [246, 16, 254, 234, 13, 201, 32]
         """
 
-        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet.data)
+        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet)
 
         #set attribute
-        self._is_open = (packet.data[1] == 0)
+        self._is_open = (packet.payload[0] == 0)
 
         self.schedule_update_ha_state()
 
+        if packet.rorg == RORG_RPS:
+            self._fire_rocker_events(packet)
+
+    def _fire_rocker_events(self, packet):
+        """Fire the events of the buttons, one event type per channel."""
+        pressed, buttons = decode_rocker(packet.payload, packet.status)
+        now = packet.received_at or perf_counter()
+        for channel, data in self._rocker.handle(pressed, buttons, now):
+            # value_changed runs on the loop
+            self.hass.bus.async_fire(
+                EVENT_ROCKER.format(self.sender_int, channel),
+                {
+                    "id": self.dev_id,
+                    "sender": f"{self.sender_int:08X}",
+                    "name": self.dev_name,
+                    "channel": channel,
+                    **data,
+                },
+            )
+
+
+class EnOceanEEPBinarySensor(EnOceanEntity, BinarySensorEntity):
+    """A binary value of a device described by the EEP registry."""
+
+    _attr_should_poll = False
+
+    def __init__(self, dev_id, dev_name, profile, description):
+        """Initialize the binary sensor of one field of the profile."""
+        super().__init__(dev_id, dev_name)
+        self.entity_description = description
+        self._profile = profile
+        self._attr_name = f"{description.name} {dev_name}"
+        self._attr_unique_id = f"{combine_hex(dev_id)}-{description.key}"
+
+    def value_changed(self, packet):
+        """Update the state, teach-in telegrams are ignored."""
+        if packet.rorg != self._profile.rorg:
+            return
+        values = packet.decode(self._profile.layout)
+        if values is None or not values.get("data_telegram", True):
+            return
+        is_on = values[self.entity_description.key] != self.entity_description.inverted
+        if is_on != self._attr_is_on:
+            self._attr_is_on = is_on
+            self.schedule_update_ha_state()
+
+    @callback
+    def async_set_state(self, is_open: bool, device_class: str | None = None):
+        """Set the state in memory, like EnOceanBinarySensor.async_set_state."""
+        if device_class is not None and device_class != self.device_class:
+            return
+        if is_open == self._attr_is_on:
+            return
+        self._attr_is_on = is_open
+        self.async_schedule_update_ha_state()
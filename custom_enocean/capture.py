@@ -0,0 +1,165 @@
+"""Capture of raw ESP3 frames to a binary log and replay of captures.
+
+A capture starts with CAPTURE_MAGIC, followed by one record per frame:
+the frame length and a monotonic timestamp (RECORD_HEADER) and the raw
+frame. The sidecar index (path + INDEX_SUFFIX) holds a fixed size record
+per frame with sender id, timestamp and offset, so both files can be
+memory-mapped and searched without parsing the capture.
+"""
+import asyncio
+from bisect import bisect_left
+import mmap
+import struct
+from threading import Lock
+from time import monotonic_ns
+
+from .esp3 import ESP3Framer
+
+CAPTURE_MAGIC = b"ENOCAP1\n"
+INDEX_SUFFIX = ".idx"
+# frame length, monotonic timestamp (ns)
+RECORD_HEADER = struct.Struct("<IQ")
+# sender id (0 for non radio frames), monotonic timestamp (ns), record offset
+INDEX_RECORD = struct.Struct("<IQQ")
+# frames replayed before yielding to the loop when replaying without delay
+REPLAY_BATCH = 1000
+
+
+class CaptureWriter:
+    """Append frames to a new capture, blocking I/O on open and close.
+
+    write and close may be called from different threads, frames written
+    after close are dropped.
+    """
+
+    def __init__(self, path):
+        """Create the capture and its index."""
+        self.path = path
+        self.frames = 0
+        self._lock = Lock()
+        self._closed = False
+        self._file = open(path, "wb")
+        self._index = open(path + INDEX_SUFFIX, "wb")
+        self._file.write(CAPTURE_MAGIC)
+        self._offset = len(CAPTURE_MAGIC)
+
+    def write(self, frame, sender_int=0, timestamp=None):
+        """Append a raw frame."""
+        if timestamp is None:
+            timestamp = monotonic_ns()
+        with self._lock:
+            if self._closed:
+                return
+            self._file.write(RECORD_HEADER.pack(len(frame), timestamp))
+            self._file.write(frame)
+            self._index.write(INDEX_RECORD.pack(sender_int, timestamp, self._offset))
+            self._offset += RECORD_HEADER.size + len(frame)
+            self.frames += 1
+
+    def close(self):
+        """Flush and close the files."""
+        with self._lock:
+            self._closed = True
+            self._file.close()
+            self._index.close()
+
+
+def _map(path):
+    with open(path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be mapped
+            return b""
+
+
+class _Timestamps:
+    """Timestamps of the index as a sequence, for bisect."""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __len__(self):
+        return len(self._index) // INDEX_RECORD.size
+
+    def __getitem__(self, position):
+        return INDEX_RECORD.unpack_from(self._index, position * INDEX_RECORD.size)[1]
+
+
+class CaptureReader:
+    """Read a capture through its memory-mapped index, blocking I/O."""
+
+    def __init__(self, path):
+        """Map the capture and its index."""
+        self._data = _map(path)
+        if self._data[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not an EnOcean capture")
+        self._index = _map(path + INDEX_SUFFIX)
+        self._timestamps = _Timestamps(self._index)
+        self._by_sender = None
+
+    def __len__(self):
+        """Return the number of frames."""
+        return len(self._timestamps)
+
+    def close(self):
+        """Unmap the files."""
+        for mapped in (self._data, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    def frame_at(self, offset):
+        """Return timestamp and frame of the record at offset."""
+        length, timestamp = RECORD_HEADER.unpack_from(self._data, offset)
+        start = offset + RECORD_HEADER.size
+        return timestamp, self._data[start : start + length]
+
+    def senders(self):
+        """Return the record offsets per sender id, built on first use."""
+        if self._by_sender is None:
+            self._by_sender = {}
+            for sender, _, offset in INDEX_RECORD.iter_unpack(self._index):
+                self._by_sender.setdefault(sender, []).append(offset)
+        return self._by_sender
+
+    def frames(self, start=None, sender=None):
+        """Yield timestamp and frame of all records from timestamp start on."""
+        if sender is not None:
+            for offset in self.senders().get(sender, ()):
+                timestamp, frame = self.frame_at(offset)
+                if start is None or timestamp >= start:
+                    yield timestamp, frame
+            return
+
+        position = 0 if start is None else bisect_left(self._timestamps, start)
+        for position in range(position, len(self._timestamps)):
+            _, _, offset = INDEX_RECORD.unpack_from(
+                self._index, position * INDEX_RECORD.size
+            )
+            yield self.frame_at(offset)
+
+
+async def async_replay(reader, frame_callback, speed=1.0, start=None, sender=None):
+    """Feed the frames of a capture to frame_callback.
+
+    With speed 1 the original timing is kept, higher values replay faster
+    and 0 replays as fast as possible. Returns the number of frames.
+    """
+    loop = asyncio.get_running_loop()
+    framer = ESP3Framer()
+    started = loop.time()
+    first = None
+    replayed = 0
+    for timestamp, raw in reader.frames(start, sender):
+        if speed:
+            if first is None:
+                first = timestamp
+            delay = (timestamp - first) / 1e9 / speed - (loop.time() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif replayed % REPLAY_BATCH == 0:
+            await asyncio.sleep(0)
+        for frame in framer.feed(raw):
+            frame_callback(frame)
+        replayed += 1
+    return replayed
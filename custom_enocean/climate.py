@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from operator import attrgetter
 
 from enocean.utils import combine_hex, to_bitarray, from_bitarray
 import voluptuous as vol
@@ -11,10 +12,12 @@ import logging
 
 from homeassistant.const import (
     ATTR_TEMPERATURE,
+    CONF_DEVICE,
     CONF_DEVICE_CLASS,
     CONF_ID,
     CONF_NAME,
     TEMP_CELSIUS,
+    Platform,
 )
 from homeassistant.components.climate import (
     PLATFORM_SCHEMA,
@@ -28,25 +31,39 @@ from homeassistant.components.climate import (
     HVACAction,
     HVACMode,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.template import is_number
 
-from .device import EnOceanEntity
+from .device import CachedAttributes, EnOceanEntity
+from .eep import RORG_4BS, TEACH_IN_4BS_FIELDS, THERMOSTAT_DATA_FIELDS
 
 from .const import (
+    CONF_DIAGNOSTIC_ENTITIES,
+    CONF_EEP,
     CONF_USE_EXTERNAL_TEMP,
+    DATA_ENOCEAN,
+    DOMAIN,
+    EEP_THERMOSTAT,
+    ENOCEAN_DISCOVERED,
+    ENOCEAN_THERMOSTATS,
+    SIGNAL_DEVICE_DISCOVERED,
     DUTY_CYCLES,
+    PRIORITY_ACTUATOR_REPLY,
+    PRIORITY_TEACH_IN,
     SERVICE_SET_DUTY_CYCLE,
     SERVICE_SET_EXT_TEMP,
     SERVICE_TRIGGER_REFERENCE_RUN,
     SERVICE_TRIGGER_STANDBY,
     THERMOSTAT_DUTY_CYCLE,
+    THERMOSTAT_REPLY_TIMEOUT,
     THERMOSTAT_SETTINGS,
     THERMOSTAT_STATE)
 
@@ -91,9 +108,34 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Optional(CONF_DEVICE_CLASS, default=CLIMATE_TYPE_THERMOSTAT): cv.string,
         vol.Optional(CONF_USE_EXTERNAL_TEMP, default=False): cv.boolean,
+        # sensors instead of attributes for values that change often
+        vol.Optional(CONF_DIAGNOSTIC_ENTITIES, default=False): cv.boolean,
     }
 )
 
+# attributes of a thermostat
+THERMOSTAT_ATTRIBUTES = {
+    "valve position": attrgetter("_valve_position"),
+    "away temperature": lambda thermostat: thermostat._target_temperature_dict[PRESET_AWAY],
+    "comfort temperature": lambda thermostat: thermostat._target_temperature_dict[PRESET_COMFORT],
+    "home temperature": lambda thermostat: thermostat._target_temperature_dict[PRESET_HOME],
+    "sleep temperature": lambda thermostat: thermostat._target_temperature_dict[PRESET_SLEEP],
+    "feed temperature": attrgetter("_feed_temperature"),
+    "harvesting active": attrgetter("_harvesting_active"),
+    "window open": attrgetter("_window_open"),
+    "duty cycle": attrgetter("_duty_cycle"),
+    "chargelevel ok": attrgetter("_chargelevel_ok"),
+    "communication ok": attrgetter("_communication_ok"),
+    "signalstrength ok": attrgetter("_signalstrength_ok"),
+    "actuator ok": attrgetter("_actuator_ok"),
+    "use external temp. sensor": attrgetter("_use_external_temp_sensor"),
+    "external temperature": attrgetter("_external_temperature"),
+}
+# change with almost every telegram, replaced by diagnostic entities if enabled.
+# The external temperature stays: it is sent to the actuator, not received
+# from it, so no diagnostic entity of the profile carries it.
+THERMOSTAT_VOLATILE_ATTRIBUTES = ("valve position", "feed temperature")
+
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -106,6 +148,7 @@ async def async_setup_platform(
     dev_name = config[CONF_NAME]
     sensor_type = config[CONF_DEVICE_CLASS]
     use_external_temp_sensor = config[CONF_USE_EXTERNAL_TEMP]
+    diagnostic_entities = config[CONF_DIAGNOSTIC_ENTITIES]
 
     entities: list[EnOceanClimate] = []
     if sensor_type == CLIMATE_TYPE_THERMOSTAT:
@@ -114,12 +157,61 @@ async def async_setup_platform(
                 dev_id,
                 dev_name,
                 use_external_temp_sensor,
-                CLIMATE_DESC_THERMOSTAT
+                CLIMATE_DESC_THERMOSTAT,
+                diagnostic_entities
             )
         ]
+        if diagnostic_entities:
+            # the sensor platform creates them
+            hass.async_create_task(
+                async_load_platform(
+                    hass,
+                    Platform.SENSOR,
+                    DOMAIN,
+                    {CONF_ID: dev_id, CONF_NAME: dev_name, CONF_EEP: EEP_THERMOSTAT},
+                    {},
+                )
+            )
 
     async_add_entities(entities)
+    async_register_services()
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the thermostats discovered by the dongle of the entry."""
+    serial_path = config_entry.data[CONF_DEVICE]
+    discovered = hass.data[DATA_ENOCEAN][ENOCEAN_DISCOVERED]
 
+    def create_thermostat(device):
+        return EnOceanThermostatSensor(
+            device.dev_id, device.name, False, CLIMATE_DESC_THERMOSTAT
+        )
+
+    async_add_entities(
+        [
+            create_thermostat(device)
+            for device in discovered.for_dongle(serial_path, EEP_THERMOSTAT)
+        ]
+    )
+    async_register_services()
+
+    @callback
+    def async_device_discovered(device):
+        if device.dongle == serial_path and device.eep == EEP_THERMOSTAT:
+            async_add_entities([create_thermostat(device)])
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_DISCOVERED, async_device_discovered)
+    )
+
+
+@callback
+def async_register_services():
+    """Register the thermostat services on the current platform."""
     platform = entity_platform.async_get_current_platform()
 
     platform.async_register_entity_service(
@@ -153,6 +245,43 @@ def limit_value(value, min_value, max_value):
         return value
 
 
+def encode_external_temperature(temperature) -> int:
+    """Return the external temperature as sent to the actuator, in 0.25 °C."""
+    return int(limit_value(temperature * 4, 0, 160))
+
+
+@callback
+def async_get_thermostat(hass: HomeAssistant, entity_id: str):
+    """Return the thermostat entity with entity_id, None if it is not set up."""
+    return hass.data.get(DATA_ENOCEAN, {}).get(ENOCEAN_THERMOSTATS, {}).get(entity_id)
+
+
+class ExternalTemperatureLink:
+    """Feeds the temperature of a sensor to a thermostat in memory.
+
+    Only changes the actuator can tell apart (0.25 °C) are passed on.
+    """
+
+    def __init__(self, entity_id: str):
+        """Initialize the link to the thermostat with entity_id."""
+        self.entity_id = entity_id
+        self._sent = None
+
+    @callback
+    def async_update(self, hass: HomeAssistant, temperature) -> None:
+        """Pass a new temperature on."""
+        if (encoded := encode_external_temperature(temperature)) == self._sent:
+            return
+        self._sent = encoded
+        if (thermostat := async_get_thermostat(hass, self.entity_id)) is None:
+            _LOGGER.debug("Thermostat %s is not set up (yet)", self.entity_id)
+            # try again with the next temperature
+            self._sent = None
+            return
+        thermostat.async_update_external_temperature(temperature)
+        _LOGGER.debug("External temperature set to %s for climate %s", temperature, self.entity_id)
+
+
 class EnOceanClimate(EnOceanEntity, RestoreEntity, ClimateEntity):
     """Representation of an  EnOcean sensor device such as a power meter."""
     _attr_should_poll = False
@@ -210,10 +339,19 @@ class EnOceanThermostatSensor(EnOceanClimate):
         dev_id,
         dev_name,
         use_external_temp_sensor,
-        description: EnOceanClimateEntityDescription
+        description: EnOceanClimateEntityDescription,
+        diagnostic_entities=False
     ):
         """Initialize the EnOcean thermostat sensor device."""
         super().__init__(dev_id, dev_name, description)
+        self._attributes = CachedAttributes(
+            {
+                label: getter
+                for label, getter in THERMOSTAT_ATTRIBUTES.items()
+                if not diagnostic_entities
+                or label not in THERMOSTAT_VOLATILE_ATTRIBUTES
+            }
+        )
 
         self._attr_native_value = None
         self._state = THERMOSTAT_STATE.UNKNOWN
@@ -236,6 +374,14 @@ class EnOceanThermostatSensor(EnOceanClimate):
         self._summer_mode = False
         self._trigger_standby = False
 
+    async def async_added_to_hass(self) -> None:
+        """Make the thermostat reachable for linked sensors."""
+        await super().async_added_to_hass()
+        thermostats = self.hass.data[DATA_ENOCEAN].setdefault(ENOCEAN_THERMOSTATS, {})
+        thermostats[self.entity_id] = self
+        entity_id = self.entity_id
+        self.async_on_remove(lambda: thermostats.pop(entity_id, None))
+
     @property
     def hvac_mode(self) -> HVACMode:
         """HVAC current mode."""
@@ -276,28 +422,8 @@ class EnOceanThermostatSensor(EnOceanClimate):
 
     @property
     def extra_state_attributes(self):
-        """Return entity specific state attributes."""
-        return {
-            "valve position": self._valve_position,
-            #"target temperature": self._target_temperature_dict[self._preset_mode],
-            #"current temperature": self._current_temperature,
-            "away temperature": self._target_temperature_dict[PRESET_AWAY],
-            "comfort temperature": self._target_temperature_dict[PRESET_COMFORT],
-            "home temperature": self._target_temperature_dict[PRESET_HOME],
-            "sleep temperature": self._target_temperature_dict[PRESET_SLEEP],
-            "feed temperature": self._feed_temperature,
-            "harvesting active": self._harvesting_active,
-            "window open": self._window_open,
-            "duty cycle": self._duty_cycle,
-            "chargelevel ok": self._chargelevel_ok,
-            "communication ok": self._communication_ok,
-            "signalstrength ok": self._signalstrength_ok,
-            "actuator ok": self._actuator_ok,
-
-            "use external temp. sensor": self._use_external_temp_sensor,
-            "external temperature": self._external_temperature,
-
-        }
+        """Return entity specific state attributes, rebuilt only on changes."""
+        return self._attributes.get(self)
 
     @property
     def state(self) -> str | None:
@@ -336,7 +462,7 @@ class EnOceanThermostatSensor(EnOceanClimate):
             self._target_temperature_dict[self._preset_mode] = limit_value(
                 kwargs[ATTR_TEMPERATURE], self._attr_min_temp, self._attr_max_temp)
             self._use_internal_setpoint = True
-        await self.async_update_ha_state()
+        self.async_schedule_update_ha_state()
 
     def set_standby(self):
         """Set standby"""
@@ -356,33 +482,43 @@ class EnOceanThermostatSensor(EnOceanClimate):
 
     async def async_set_external_temperature(self, temperature: int):
         """Set external temperature"""
+        self.async_update_external_temperature(temperature)
+
+    @callback
+    def async_update_external_temperature(self, temperature):
+        """Set external temperature, also used by linked sensors."""
         self._external_temperature = limit_value(temperature, 0, 80)
         if (self._use_external_temp_sensor):
             self._current_temperature = self._external_temperature 
 
-        await self.async_update_ha_state()
+        self.async_schedule_update_ha_state()
 
     def value_changed(self, packet):
 
-        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet.data)
+        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet)
 
-        databits = to_bitarray(packet.data)
-        self._attr_native_value = databits
+        if packet.rorg != RORG_4BS or (
+            values := packet.decode(THERMOSTAT_DATA_FIELDS)
+        ) is None:
+            _LOGGER.error(
+                "[%s] unexpected telegram: %s", self.dev_name, packet)
+            return
 
-        teach_in = not databits[36]
+        teach_in = not values["data_telegram"]
 
         if teach_in:
             # teach-in
-            self.handle_teachin_telegram(databits)
+            self.handle_teachin_telegram(
+                TEACH_IN_4BS_FIELDS.decode(packet.payload))
 
         else:
             # normal mode
-            self.handle_data_telegram(databits)
+            self.handle_data_telegram(values)
 
         """Update the internal state of the sensor."""
         self.schedule_update_ha_state()
 
-    def handle_data_telegram(self, databits):
+    def handle_data_telegram(self, values):
         _LOGGER.debug("[%s] handle data telegram", self.dev_name)
 
         if (not self._summer_mode):
@@ -391,27 +527,27 @@ class EnOceanThermostatSensor(EnOceanClimate):
             self._state = THERMOSTAT_STATE.SUMMER
 
         # extract properties
-        self._valve_position = from_bitarray(databits[8:16])
-        local_offset_mode = databits[16]  # should always be 1
-        tslmode = databits[32]
-        self._harvesting_active = databits[33]
-        self._chargelevel_ok = databits[34]
-        self._window_open = databits[35]
-        self._communication_ok = not databits[37]
-        self._signalstrength_ok = not databits[38]
-        self._actuator_ok = not databits[39]
+        self._valve_position = values["valve_position"]
+        local_offset_mode = values["local_offset_mode"]  # should always be 1
+        tslmode = values["tslmode"]
+        self._harvesting_active = values["harvesting_active"]
+        self._chargelevel_ok = values["chargelevel_ok"]
+        self._window_open = values["window_open"]
+        self._communication_ok = not values["communication_error"]
+        self._signalstrength_ok = not values["signalstrength_error"]
+        self._actuator_ok = not values["actuator_error"]
 
         # if lom == 0 bit 9...15 represents temprature difference to the current target temperatur
         # -> room contol only sends the valve position, actuator does not know the target temperature
         if (local_offset_mode == 1 and not self._use_internal_setpoint):
-            self._target_temperature_dict[self._preset_mode] = from_bitarray(databits[17:24])/2.0
+            self._target_temperature_dict[self._preset_mode] = values["target_temperature"]
 
         self._use_internal_setpoint = False
 
         if(tslmode == 0):
-            self._current_temperature = from_bitarray(databits[24:32])/2.0
+            self._current_temperature = values["temperature"]
         else:
-            self._feed_temperature = from_bitarray(databits[24:32])/2.0
+            self._feed_temperature = values["temperature"]
 
         # trigger a warning, if the TSL does not match value sent to ACT (selection of temperature sensor (ext/int) )
         if (tslmode != self._use_external_temp_sensor):
@@ -437,21 +573,16 @@ class EnOceanThermostatSensor(EnOceanClimate):
 
         self.send_response()
 
-    def handle_teachin_telegram(self, databits):
+    def handle_teachin_telegram(self, values):
         _LOGGER.debug("[%s] handle teach in telegram", self.dev_name)
         self._state = THERMOSTAT_STATE.TEACH_IN
 
         # extract properties
-        program = (from_bitarray(databits[0:8]))
-        function = (from_bitarray(databits[8:14]))
-        type = (from_bitarray(databits[14:21]))
-        manufacturer_id = (from_bitarray(databits[21:32]))
+        function = values["function"]
+        type = values["type"]
+        manufacturer_id = values["manufacturer_id"]
 
-        # check properties
-        if (program != 0xa5):
-            _LOGGER.error(
-                "[%s] unexpected program id: %s, expected 0xa5", self.dev_name, program)
-            return
+        # check properties, the program id (0xa5) was checked already
         if (function != 0x20):
             _LOGGER.error(
                 "[%s] unexpected function id: %s, expected 0x20", self.dev_name, function)
@@ -473,19 +604,20 @@ class EnOceanThermostatSensor(EnOceanClimate):
             data=[0xa5, 0x80, 0x30, 0x49, 0xf0, 0x00, 0x00, 0x00, 0x00, 0x00],
             optional=optional,
             packet_type=0x01,
+            priority=PRIORITY_TEACH_IN,
+            max_age=THERMOSTAT_REPLY_TIMEOUT,
         )
 
-        # send first telegram
-        self.send_response()
+        # send first telegram, queued behind the teach-in response
+        self.send_response(PRIORITY_TEACH_IN)
 
-    def send_response(self):
+    def send_response(self, priority=PRIORITY_ACTUATOR_REPLY):
         data = [0xa5]
         # DB3
         data.extend([int(self._target_temperature_dict[self._preset_mode] * 2)])
         # DB2
         if (self._use_external_temp_sensor):
-            data.extend(
-                [int(limit_value(self._external_temperature * 4, 0, 160))])
+            data.extend([encode_external_temperature(self._external_temperature)])
         else:
             data.extend([0x00])
         # DB1
@@ -510,4 +642,6 @@ class EnOceanThermostatSensor(EnOceanClimate):
             data=data,
             optional=optional,
             packet_type=0x01,
+            priority=priority,
+            max_age=THERMOSTAT_REPLY_TIMEOUT,
         )
@@ -5,9 +5,17 @@ import logging
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_DEVICE
+from homeassistant.core import callback
 
 from . import dongle
-from .const import DOMAIN, ERROR_INVALID_DONGLE_PATH, LOGGER
+from .const import (
+    CONF_TRANSPORT,
+    DOMAIN,
+    ERROR_INVALID_DONGLE_PATH,
+    LOGGER,
+    TRANSPORT_THREAD,
+    TRANSPORTS,
+)
 
 
 class EnOceanFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,9 +29,27 @@ class EnOceanFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self.dongle_path = None
         self.discovery_info = None
 
-    async def async_step_import(self, data=None):
-        """Import a yaml configuration."""
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return EnOceanOptionsFlowHandler(config_entry)
 
+    async def async_step_import(self, data=None):
+        """Import a yaml configuration.
+
+        The entry of a configured dongle is updated if the yaml changed,
+        its update listener reloads it. The yaml overrides the options.
+        """
+
+        for entry in self._async_current_entries():
+            if entry.data[CONF_DEVICE] != data[CONF_DEVICE]:
+                continue
+            if entry.data != data or entry.options:
+                self.hass.config_entries.async_update_entry(
+                    entry, data=data, options={}
+                )
+            return self.async_abort(reason="already_configured")
         if not await self.validate_enocean_conf(data):
             LOGGER.warning(
                 "Cannot import yaml configuration: %s is not a valid dongle path",
@@ -34,10 +60,10 @@ class EnOceanFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         return self.create_enocean_entry(data)
 
     async def async_step_user(self, user_input=None):
-        """Handle an EnOcean config flow start."""
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
+        """Handle an EnOcean config flow start.
 
+        Several dongles can be set up, each one only once.
+        """
         return await self.async_step_detect()
 
     async def async_step_detect(self, user_input=None):
@@ -50,7 +76,11 @@ class EnOceanFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.create_enocean_entry(user_input)
             errors = {CONF_DEVICE: ERROR_INVALID_DONGLE_PATH}
 
-        bridges = await self.hass.async_add_executor_job(dongle.detect)
+        # configured dongles are in use, don't probe them
+        configured = {
+            entry.data[CONF_DEVICE] for entry in self._async_current_entries()
+        }
+        bridges = await dongle.async_detect(self.hass, configured)
         if len(bridges) == 0:
             return await self.async_step_manual(user_input)
 
@@ -81,12 +111,34 @@ class EnOceanFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def validate_enocean_conf(self, user_input) -> bool:
         """Return True if the user_input contains a valid dongle path."""
-        dongle_path = user_input[CONF_DEVICE]
-        path_is_valid = await self.hass.async_add_executor_job(
-            dongle.validate_path, dongle_path
-        )
-        return path_is_valid
+        return await dongle.async_validate_path(self.hass, user_input[CONF_DEVICE])
 
     def create_enocean_entry(self, user_input):
         """Create an entry for the provided configuration."""
-        return self.async_create_entry(title="EnOcean", data=user_input)
+        self._async_abort_entries_match({CONF_DEVICE: user_input[CONF_DEVICE]})
+        return self.async_create_entry(
+            title=f"EnOcean {user_input[CONF_DEVICE]}", data=user_input
+        )
+
+
+class EnOceanOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options of a dongle."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Choose the serial transport."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        transport = self.config_entry.options.get(
+            CONF_TRANSPORT, self.config_entry.data.get(CONF_TRANSPORT, TRANSPORT_THREAD)
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {vol.Required(CONF_TRANSPORT, default=transport): vol.In(TRANSPORTS)}
+            ),
+        )
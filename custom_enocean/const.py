@@ -7,15 +7,42 @@ from typing import Final
 
 DOMAIN = "custom_enocean"
 DATA_ENOCEAN = "custom_enocean"
-ENOCEAN_DONGLE = "dongle"
+ENOCEAN_RECEIVERS = "receivers"
+ENOCEAN_DISCOVERED = "discovered"
+ENOCEAN_COALESCER = "coalescer"
+ENOCEAN_ROUTES = "routes"
+ENOCEAN_THERMOSTATS = "thermostats"
+
+# seconds state writes are collected, 0 writes once per loop iteration
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+CONF_TRANSPORT = "transport"
+CONF_EEP = "eep"
+CONF_DIAGNOSTIC_ENTITIES = "diagnostic_entities"
+TRANSPORT_THREAD = "thread"
+TRANSPORT_ASYNCIO = "asyncio"
+TRANSPORTS = [TRANSPORT_THREAD, TRANSPORT_ASYNCIO]
 
 ERROR_INVALID_DONGLE_PATH = "invalid_dongle_path"
 
-SIGNAL_RECEIVE_MESSAGE = "enocean.receive_message"
 SIGNAL_SEND_MESSAGE = "enocean.send_message"
+SIGNAL_DEVICE_DISCOVERED = "enocean.device_discovered"
+
+# events of the motion detectors of a multisensor, e.g. custom_enocean_tilt
+EVENT_MOTION = "custom_enocean_{}"
+# events of a rocker switch, per sender id (8 hex digits) and channel (a, b, all)
+EVENT_ROCKER = "custom_enocean_rocker_{:08x}_{}"
+
+# EEPs of the devices created on teach-in
+EEP_THERMOSTAT: Final = "A5-20-06"
+EEP_MULTISENSOR: Final = "D2-14-41"
 
 LOGGER = logging.getLogger(__package__)
 
+# transmit priorities, lower values are sent first
+PRIORITY_ACTUATOR_REPLY: Final = 0
+PRIORITY_TEACH_IN: Final = 1
+PRIORITY_COMMAND: Final = 2
+
 PLATFORMS = [
     Platform.BINARY_SENSOR,
     Platform.CLIMATE
@@ -25,6 +52,18 @@ SERVICE_TRIGGER_STANDBY: Final = "trigger_standby"
 SERVICE_TRIGGER_REFERENCE_RUN: Final = "trigger_reference_run"
 SERVICE_SET_DUTY_CYCLE: Final = "set_duty_cycle"
 SERVICE_SET_EXT_TEMP: Final = "set_external_temperature"
+SERVICE_START_CAPTURE: Final = "start_capture"
+SERVICE_STOP_CAPTURE: Final = "stop_capture"
+SERVICE_REPLAY_CAPTURE: Final = "replay_capture"
+SERVICE_DUMP_LATENCY: Final = "dump_latency"
+SERVICE_SET_STATE: Final = "set_state"
+
+ATTR_DEVICE: Final = "device"
+ATTR_PATH: Final = "path"
+ATTR_SPEED: Final = "speed"
+ATTR_IS_OPEN: Final = "is_open"
+# formatted with the identifier of the dongle
+DEFAULT_CAPTURE_FILE: Final = "enocean_capture_{}.bin"
 
 DUTY_CYCLES: Final = [
     "AUTO",
@@ -45,6 +84,9 @@ THERMOSTAT_SETTINGS: Final = {
     "step": 0.5
 }
 
+# the actuator only listens for a short time after its own telegram (seconds)
+THERMOSTAT_REPLY_TIMEOUT: Final = 1.0
+
 THERMOSTAT_DUTY_CYCLE: Final ={
     "AUTO": 0,
     "2_MIN": 1,
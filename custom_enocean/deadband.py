@@ -0,0 +1,49 @@
+"""Change detection with per-attribute deadbands before writing state."""
+from time import monotonic
+
+# write at least this often (seconds), even if nothing changed
+DEFAULT_MAX_SILENCE = 1800
+
+
+class DeadbandFilter:
+    """Decide which new values are worth a state write.
+
+    Each value is tracked on its own: it is due if it moved by more than
+    its deadband since it was last written, values without a deadband on
+    any change. A value not written for max_silence seconds is due as
+    well, 0 disables this.
+
+    >>> deadband = DeadbandFilter({"temperature": 0.5}, max_silence=0)
+    >>> sorted(deadband.due({"temperature": 21.0, "humidity": 40}))
+    ['humidity', 'temperature']
+    >>> sorted(deadband.due({"temperature": 21.3, "humidity": 41}))
+    ['humidity']
+    >>> sorted(deadband.due({"temperature": 21.6, "humidity": 41}))
+    ['temperature']
+    """
+
+    def __init__(self, deadbands=None, max_silence=DEFAULT_MAX_SILENCE):
+        """Initialize the filter."""
+        self._deadbands = deadbands or {}
+        self._max_silence = max_silence
+        # key -> (value, time) of the last write
+        self._written = {}
+
+    def due(self, values) -> set:
+        """Return the keys of the values to write, remember those values."""
+        now = monotonic()
+        due = set()
+        for key, value in values.items():
+            written = self._written.get(key)
+            if (
+                written is None
+                or abs(value - written[0]) > self._deadbands.get(key, 0)
+                or (self._max_silence and now - written[1] >= self._max_silence)
+            ):
+                self._written[key] = (value, now)
+                due.add(key)
+        return due
+
+    def force(self):
+        """Write all values with the next telegram, e.g. after a change elsewhere."""
+        self._written.clear()
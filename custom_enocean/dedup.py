@@ -0,0 +1,46 @@
+"""Suppression of telegrams that arrive more than once through repeaters."""
+from collections import Counter, OrderedDict
+from time import monotonic
+
+# repeaters retransmit within a few hundred milliseconds
+DEFAULT_TTL = 1.0
+DEFAULT_MAX_SIZE = 1024
+# lower nibble of the status byte: number of repeaters the telegram passed
+REPEATER_COUNT_MASK = 0x0F
+
+
+class DuplicateFilter:
+    """Bounded LRU cache of the telegrams seen during the last ttl seconds.
+
+    A telegram is a copy if the same sender sent the same payload within
+    ttl and a repeater forwarded it (repeater count > 0) or another
+    receiver already delivered it. An identical telegram received directly
+    by the same receiver is a new one, e.g. a button pressed twice.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE):
+        """Initialize the filter."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._seen = OrderedDict()
+        # suppressed copies per sender id
+        self.suppressed = Counter()
+
+    def is_duplicate(self, sender_int, payload, status, receiver=None) -> bool:
+        """Return True if the telegram is a copy, remember it otherwise."""
+        now = monotonic()
+        key = (sender_int, payload)
+        seen = self._seen.get(key)
+        if (
+            seen is not None
+            and now - seen[0] < self._ttl
+            and (status & REPEATER_COUNT_MASK or seen[1] is not receiver)
+        ):
+            self.suppressed[sender_int] += 1
+            return True
+
+        self._seen[key] = (now, receiver)
+        self._seen.move_to_end(key)
+        if len(self._seen) > self._max_size:
+            self._seen.popitem(last=False)
+        return False
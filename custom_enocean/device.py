@@ -1,11 +1,107 @@
 """Representation of an EnOcean device."""
+import logging
+from time import perf_counter
+
 from enocean.protocol.packet import Packet
 from enocean.utils import combine_hex
 
-from homeassistant.helpers.dispatcher import async_dispatcher_connect, dispatcher_send
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import dispatcher_send
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DATA_ENOCEAN,
+    ENOCEAN_COALESCER,
+    PRIORITY_COMMAND,
+    SIGNAL_SEND_MESSAGE,
+)
+from .dongle import async_register_entity
+from .stats import STAGE_DISPATCH, STAGE_VALUE_CHANGED
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateWriteCoalescer:
+    """Write the states of entities changed in a burst together.
+
+    Entities are marked dirty and written once per loop iteration, or
+    once per interval (seconds) if one is configured.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval=0):
+        """Initialize the coalescer."""
+        self.hass = hass
+        self.interval = interval
+        self._dirty = {}
+        self._scheduled = False
+        # state writes asked for and done
+        self.requested = 0
+        self.written = 0
+
+    @property
+    def saved(self) -> int:
+        """Return the number of state writes saved by coalescing."""
+        return self.requested - self.written - len(self._dirty)
+
+    @callback
+    def async_mark_dirty(self, entity):
+        """Write the state of entity with the next flush."""
+        self.requested += 1
+        # dict as ordered set
+        self._dirty[entity] = None
+        if self._scheduled:
+            return
+        self._scheduled = True
+        if self.interval:
+            async_call_later(self.hass, self.interval, self._async_flush)
+        else:
+            self.hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self, now=None):
+        self._scheduled = False
+        dirty, self._dirty = self._dirty, {}
+        for entity in dirty:
+            # skip entities removed in the meantime
+            if entity.hass is not None and entity.platform is not None:
+                entity.async_write_ha_state()
+                self.written += 1
+
+
+@callback
+def async_get_coalescer(hass: HomeAssistant) -> StateWriteCoalescer:
+    """Return the state write coalescer, set up by the component.
 
-from .const import SIGNAL_RECEIVE_MESSAGE, SIGNAL_SEND_MESSAGE
+    Called for every state write, creates one only if it is missing.
+    """
+    data = hass.data.setdefault(DATA_ENOCEAN, {})
+    if (coalescer := data.get(ENOCEAN_COALESCER)) is None:
+        coalescer = data[ENOCEAN_COALESCER] = StateWriteCoalescer(hass)
+    return coalescer
+
+
+class CachedAttributes:
+    """State attributes rebuilt only when one of their values changed.
+
+    getters maps the labels to functions reading the value from the
+    entity, the same dict is returned while the values stay equal.
+    """
+
+    def __init__(self, getters):
+        """Initialize the cache."""
+        self.labels = tuple(getters)
+        self._getters = tuple(getters.values())
+        self._values = None
+        self._attributes = None
+
+    def get(self, entity) -> dict:
+        """Return the attributes of entity."""
+        values = tuple(getter(entity) for getter in self._getters)
+        if values != self._values:
+            self._values = values
+            self._attributes = dict(zip(self.labels, values))
+        return self._attributes
 
 
 class EnOceanEntity(Entity):
@@ -15,26 +111,75 @@ class EnOceanEntity(Entity):
         """Initialize the device."""
         self.dev_id = dev_id
         self.dev_name = dev_name
+        # precomputed once, used as key in the dongle's routing table
+        self.sender_int = combine_hex(dev_id)
+        # read time of the telegram being handled, for the reply latency
+        self._received_at = None
+        # the telegram being handled comes from a capture
+        self._replayed = False
 
     async def async_added_to_hass(self):
         """Register callbacks."""
         self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass, SIGNAL_RECEIVE_MESSAGE, self._message_received_callback
-            )
+            async_register_entity(self.hass, self.sender_int, self)
         )
 
+    @callback
     def _message_received_callback(self, packet):
-        """Handle incoming packets."""
+        """Handle incoming telegrams.
 
-        if packet.sender_int == combine_hex(self.dev_id):
+        The dongle only routes telegrams of our own sender id to us. Runs
+        on the loop, so telegrams are handled one by one in arrival order.
+        """
+        started = perf_counter()
+        packet.latency.record(STAGE_DISPATCH, started - packet.parsed_at)
+        self._received_at = packet.received_at
+        self._replayed = packet.replayed
+        try:
             self.value_changed(packet)
+        finally:
+            self._received_at = None
+            self._replayed = False
+        packet.latency.record(STAGE_VALUE_CHANGED, perf_counter() - started)
 
     def value_changed(self, packet):
-        """Update the internal state of the device when a packet arrives."""
+        """Update the internal state of the device when a telegram arrives.
 
-    def send_command(self, data, optional, packet_type):
-        """Send a command via the EnOcean dongle."""
+        packet is a Telegram, its data attribute matches RadioPacket.data.
+        """
+
+    def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Schedule a coalesced state write, thread safe."""
+        if force_refresh:
+            super().schedule_update_ha_state(force_refresh)
+            return
+        self.hass.loop.call_soon_threadsafe(
+            async_get_coalescer(self.hass).async_mark_dirty, self
+        )
+
+    @callback
+    def async_schedule_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Schedule a coalesced state write."""
+        if force_refresh:
+            super().async_schedule_update_ha_state(force_refresh)
+            return
+        async_get_coalescer(self.hass).async_mark_dirty(self)
+
+    def send_command(
+        self, data, optional, packet_type, priority=PRIORITY_COMMAND, max_age=None
+    ):
+        """Send a command via the EnOcean dongle.
+
+        Commands with a max_age (seconds) are dropped if the dongle
+        could not send them in time. Replies to replayed telegrams are
+        dropped, a replay must not reach the devices.
+        """
 
         packet = Packet(packet_type, data=data, optional=optional)
-        dispatcher_send(self.hass, SIGNAL_SEND_MESSAGE, packet)
+        if self._replayed:
+            _LOGGER.debug("Not sending a reply to a replayed telegram: %s", packet)
+            return
+        packet.received_at = self._received_at
+        dispatcher_send(
+            self.hass, SIGNAL_SEND_MESSAGE, packet, priority, max_age, self.sender_int
+        )
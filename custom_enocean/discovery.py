@@ -0,0 +1,116 @@
+"""Discovery of EnOcean devices by their teach-in telegrams."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SIGNAL_DEVICE_DISCOVERED
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.devices"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+RORG_4BS = 0xA5
+RORG_UTE = 0xD4
+
+
+def format_eep(rorg: int, func: int, eep_type: int) -> str:
+    """Return an EEP in the usual notation, e.g. A5-20-06."""
+    return f"{rorg:02X}-{func:02X}-{eep_type:02X}"
+
+
+def parse_teach_in(data) -> tuple[str, int] | None:
+    """Return EEP and manufacturer id of a teach-in telegram, None otherwise.
+
+    Supports 4BS teach-in with EEP (variant 2) and UTE teach-in queries.
+    data holds the whole ERP1 data, starting with the RORG.
+    """
+    if data[0] == RORG_4BS and len(data) >= 5:
+        db3, db2, db1, db0 = data[1], data[2], data[3], data[4]
+        # LRN bit cleared: teach-in, LRN type set: EEP and manufacturer included
+        if db0 & 0x08 or not db0 & 0x80:
+            return None
+        func = db3 >> 2
+        eep_type = (db3 & 0x03) << 5 | db2 >> 3
+        manufacturer = (db2 & 0x07) << 8 | db1
+        return format_eep(RORG_4BS, func, eep_type), manufacturer
+
+    if data[0] == RORG_UTE and len(data) >= 8:
+        # DB6 flags, DB5 channels, DB4/DB3 manufacturer, DB2 type, DB1 func, DB0 rorg
+        manufacturer = (data[4] & 0x07) << 8 | data[3]
+        return format_eep(data[7], data[6], data[5]), manufacturer
+
+    return None
+
+
+@dataclass
+class DiscoveredDevice:
+    """A device that announced itself by a teach-in telegram."""
+
+    sender_int: int
+    eep: str
+    manufacturer: int
+    # serial path of the dongle that received the teach-in
+    dongle: str
+
+    @property
+    def dev_id(self) -> list[int]:
+        """Return the id as list of bytes, like in the yaml configuration."""
+        return list(self.sender_int.to_bytes(4, "big"))
+
+    @property
+    def name(self) -> str:
+        """Return a default name."""
+        return f"EnOcean {self.eep} {self.sender_int:08X}"
+
+
+class DiscoveredDevices:
+    """Persistent store of the discovered devices."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the store."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.devices: dict[int, DiscoveredDevice] = {}
+
+    async def async_load(self):
+        """Load all devices with one read."""
+        data = await self._store.async_load() or {}
+        for device in data.get("devices", []):
+            self.devices[device["sender_int"]] = DiscoveredDevice(**device)
+
+    def for_dongle(
+        self, serial_path: str, eep: str | None = None
+    ) -> list[DiscoveredDevice]:
+        """Return the devices of a dongle, only those with eep if given."""
+        return [
+            device
+            for device in self.devices.values()
+            if device.dongle == serial_path and eep in (None, device.eep)
+        ]
+
+    @callback
+    def async_add(self, sender_int: int, eep: str, manufacturer: int, dongle: str):
+        """Remember a new device and announce it to the platforms."""
+        if sender_int in self.devices:
+            return
+        device = DiscoveredDevice(sender_int, eep, manufacturer, dongle)
+        self.devices[sender_int] = device
+        _LOGGER.info(
+            "Discovered EnOcean device %08X (EEP %s, manufacturer %s)",
+            sender_int,
+            eep,
+            manufacturer,
+        )
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        async_dispatcher_send(self.hass, SIGNAL_DEVICE_DISCOVERED, device)
+
+    @callback
+    def _data_to_save(self):
+        return {"devices": [asdict(device) for device in self.devices.values()]}
@@ -1,18 +1,74 @@
 """Representation of an EnOcean dongle."""
+import asyncio
+from collections import Counter
+from datetime import timedelta
+from functools import partial
 import glob
 import logging
-from os.path import basename, normpath
+from os.path import basename, normpath, realpath
+from time import monotonic, perf_counter
 
 from enocean.communicators import SerialCommunicator
 from enocean.protocol.packet import RadioPacket
 import serial
+import serial_asyncio
+from serial.tools import list_ports
 
-from homeassistant.helpers.dispatcher import async_dispatcher_connect, dispatcher_send
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 
-from .const import SIGNAL_RECEIVE_MESSAGE, SIGNAL_SEND_MESSAGE
+from .const import (
+    DATA_ENOCEAN,
+    DOMAIN,
+    ENOCEAN_DISCOVERED,
+    ENOCEAN_RECEIVERS,
+    ENOCEAN_ROUTES,
+    PRIORITY_COMMAND,
+    SIGNAL_SEND_MESSAGE,
+    TRANSPORT_ASYNCIO,
+    TRANSPORT_THREAD,
+)
+from .capture import CaptureReader, CaptureWriter, async_replay
+from .dedup import DuplicateFilter
+from .discovery import parse_teach_in
+from .esp3 import (
+    PACKET_TYPE_COMMON_COMMAND,
+    PACKET_TYPE_RADIO_ERP1,
+    PACKET_TYPE_RESPONSE,
+    RETURN_CODE_OK,
+    ESP3Framer,
+    build_frame,
+)
+from .stats import STAGE_LOOP_HOP, STAGE_PARSE, LatencyStats
+from .telegram import Telegram
+from .transmit import TransmitQueue
 
 _LOGGER = logging.getLogger(__name__)
 
+# a dongle that heard a device better is preferred for this long (seconds)
+LINK_MAX_AGE = 1800
+# the thread of python-enocean ends silently if the port fails
+CONNECTION_CHECK_INTERVAL = timedelta(seconds=10)
+# exponential backoff between reconnect attempts (seconds)
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# USB 300, 310 and 400: an FTDI FT232R naming EnOcean in its descriptors,
+# other serial ports (Zigbee or Z-Wave sticks) are never probed
+USB_VID_PID = {(0x0403, 0x6001)}
+USB_NAME = "enocean"
+# stable names of the ports, preferred over /dev/ttyUSBn
+SERIAL_BY_ID_GLOB = "/dev/serial/by-id/*"
+# seconds a port has to answer a version request
+PROBE_TIMEOUT = 2
+# only dongles found are stored, busy or silent ports are probed again
+PROBE_CACHE_KEY = f"{DOMAIN}.probe_cache"
+PROBE_CACHE_VERSION = 1
+# ESP3 common command: read version information
+CO_RD_VERSION = 0x03
+
 
 class EnOceanDongle:
     """Representation of an EnOcean dongle.
@@ -21,35 +77,293 @@ class EnOceanDongle:
     creating devices if needed, and dispatching messages to platforms.
     """
 
-    def __init__(self, hass, serial_path):
+    def __init__(self, hass, serial_path, transport=TRANSPORT_THREAD):
         """Initialize the EnOcean dongle."""
 
-        self._communicator = SerialCommunicator(
-            port=serial_path, callback=self.callback
-        )
+        self._communicator = None
+        self._transport = None
+        self.transport_mode = transport
         self.serial_path = serial_path
         self.identifier = basename(normpath(serial_path))
         self.hass = hass
         self.dispatcher_disconnect_handle = None
+        self.latency = LatencyStats()
+        self.transmit_queue = TransmitQueue(self._write_packet, self.latency)
+        self._capture = None
+        # sender id -> entities, shared with the entities (see async_register_entity)
+        self._routes = hass.data.setdefault(DATA_ENOCEAN, {}).setdefault(
+            ENOCEAN_ROUTES, {}
+        )
+        # all dongles, they receive as one
+        self._receivers = hass.data[DATA_ENOCEAN].setdefault(
+            ENOCEAN_RECEIVERS, ReceiverGroup()
+        )
+        # telegrams from senders no entity is registered for
+        self.unmatched_senders = Counter()
+        # connection state
+        self._unloaded = False
+        self._reconnect_task = None
+        self._disconnected_at = None
+        self._unsub_connection_check = None
+        self.reconnects = 0
+        self._downtime = 0.0
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the serial port is open."""
+        return self._disconnected_at is None
+
+    @property
+    def downtime(self) -> float:
+        """Return the seconds the dongle was disconnected since setup."""
+        if self._disconnected_at is None:
+            return self._downtime
+        return self._downtime + monotonic() - self._disconnected_at
 
     async def async_setup(self):
         """Finish the setup of the bridge and supported platforms."""
-        self._communicator.start()
+        await self._async_connect()
+        if self.transport_mode == TRANSPORT_THREAD:
+            self._unsub_connection_check = async_track_time_interval(
+                self.hass, self._async_check_connection, CONNECTION_CHECK_INTERVAL
+            )
+        self.transmit_queue.async_start(self.hass.loop)
+        self._receivers.add(self)
+        # devices answer only to the base id of the dongle they were taught in to
+        discovered = self.hass.data[DATA_ENOCEAN].get(ENOCEAN_DISCOVERED)
+        if discovered is not None:
+            for device in discovered.for_dongle(self.serial_path):
+                self._receivers.pin(device.sender_int, self)
         self.dispatcher_disconnect_handle = async_dispatcher_connect(
             self.hass, SIGNAL_SEND_MESSAGE, self._send_message_callback
         )
 
+    async def _async_connect(self):
+        """Open the serial port, raises serial.SerialException on failure."""
+        if self.transport_mode == TRANSPORT_ASYNCIO:
+            self._transport, _ = await serial_asyncio.create_serial_connection(
+                self.hass.loop,
+                lambda: EnOceanProtocol(
+                    self._async_callback, self._async_connection_lost
+                ),
+                self.serial_path,
+                baudrate=57600,
+            )
+        else:
+            # the communicator opens the port when it is created
+            self._communicator = await self.hass.async_add_executor_job(
+                partial(SerialCommunicator, port=self.serial_path, callback=self.callback)
+            )
+            self._communicator.start()
+
+    @callback
+    def _async_check_connection(self, now=None):
+        """Notice a stopped thread of the threaded transport."""
+        if self._communicator and not self._communicator.is_alive():
+            self._communicator = None
+            self._async_connection_lost()
+
+    @callback
+    def _async_connection_lost(self):
+        """Keep the entities, hold outgoing packets and reopen the port."""
+        if self._unloaded or self._reconnect_task:
+            return
+        _LOGGER.warning("Lost connection to EnOcean dongle %s", self.serial_path)
+        self._transport = None
+        self._disconnected_at = monotonic()
+        self.transmit_queue.async_pause()
+        self._reconnect_task = self.hass.loop.create_task(self._async_reconnect())
+
+    async def _async_reconnect(self):
+        """Reopen the serial port with exponential backoff."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._async_connect()
+            except (serial.SerialException, OSError) as exception:
+                _LOGGER.debug(
+                    "Reconnecting to %s failed: %s", self.serial_path, exception
+                )
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            else:
+                break
+
+        self.reconnects += 1
+        self._downtime += monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self._reconnect_task = None
+        self.transmit_queue.async_resume()
+        _LOGGER.info("Reconnected to EnOcean dongle %s", self.serial_path)
+
     def unload(self):
         """Disconnect callbacks established at init time."""
+        self._unloaded = True
         if self.dispatcher_disconnect_handle:
             self.dispatcher_disconnect_handle()
             self.dispatcher_disconnect_handle = None
+        if self._unsub_connection_check:
+            self._unsub_connection_check()
+            self._unsub_connection_check = None
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._receivers.remove(self)
+        self.transmit_queue.async_stop()
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        if self._communicator:
+            self._communicator.stop()
+            self._communicator = None
+        if self._capture:
+            self._capture.close()
+            self._capture = None
+
+    async def async_start_capture(self, path):
+        """Write every received frame to a capture at path."""
+        await self.async_stop_capture()
+        self._capture = await self.hass.async_add_executor_job(CaptureWriter, path)
+        _LOGGER.info("Capturing EnOcean frames to %s", path)
+
+    async def async_stop_capture(self):
+        """Stop a running capture."""
+        capture, self._capture = self._capture, None
+        if capture:
+            await self.hass.async_add_executor_job(capture.close)
+            _LOGGER.info("Captured %s frames to %s", capture.frames, capture.path)
+
+    async def async_replay(self, path, speed=1.0):
+        """Feed a capture through the receive path, see capture.async_replay.
+
+        Replayed teach-in telegrams discover no devices.
+
+        >>> import os, tempfile
+        >>> from types import SimpleNamespace
+        >>> discovered = []
+        >>> async def run(func, *args):
+        ...     return func(*args)
+        >>> hass = SimpleNamespace(async_add_executor_job=run, data={DATA_ENOCEAN: {
+        ...     ENOCEAN_DISCOVERED: SimpleNamespace(async_add=lambda *a: discovered.append(a))
+        ... }})
+        >>> usb_dongle = EnOceanDongle(hass, "/dev/ttyUSB0")
+        >>> path = os.path.join(tempfile.mkdtemp(), "teach_in.bin")
+        >>> capture = CaptureWriter(path)
+        >>> teach_in = [0xA5, 0x80, 0x30, 0x49, 0x80, 1, 2, 3, 4, 0]  # A5-20-06
+        >>> capture.write(build_frame(PACKET_TYPE_RADIO_ERP1, teach_in, [0]))
+        >>> capture.close()
+        >>> asyncio.run(usb_dongle.async_replay(path, speed=0))
+        >>> discovered, usb_dongle.unmatched_senders
+        ([], Counter())
+        """
+        reader = await self.hass.async_add_executor_job(CaptureReader, path)
+        try:
+            replayed = await async_replay(
+                reader, partial(self._async_dispatch_frame, replayed=True), speed
+            )
+        finally:
+            reader.close()
+        _LOGGER.info("Replayed %s frames from %s", replayed, path)
+
+    @callback
+    def _send_message_callback(
+        self, command, priority=PRIORITY_COMMAND, max_age=None, sender_int=None
+    ):
+        """Queue a command, if this dongle reaches the device best."""
+        if self._receivers.transmitter(sender_int) is self:
+            self.transmit_queue.async_put(command, priority, max_age)
+
+    def _write_packet(self, packet):
+        """Send a packet through the EnOcean dongle."""
+        if self._transport:
+            # buffered by the transport, never blocks the loop
+            self._transport.write(bytes(packet.build()))
+        else:
+            self._communicator.send(packet)
+        _LOGGER.debug("sending: %s", packet)
 
-    def _send_message_callback(self, command):
-        """Send a command through the EnOcean dongle."""
-        self._communicator.send(command)
-        _LOGGER.debug("sending: %s", command)
+    def _lookup_entities(self, sender_int):
+        """Return the entities registered for a sender, count unknown senders."""
+        entities = self._routes.get(sender_int)
+        if entities is None:
+            self.unmatched_senders[sender_int] += 1
+        return entities
 
+    @callback
+    def _async_callback(self, frame, received_at):
+        """Handle a frame read by the asyncio transport."""
+        if self._capture:
+            radio = frame.packet_type == PACKET_TYPE_RADIO_ERP1
+            self._capture.write(frame.raw, frame.sender_int if radio else 0)
+        self._async_dispatch_frame(frame, received_at)
+
+    @callback
+    def _async_dispatch_frame(self, frame, received_at=None, replayed=False):
+        """Hand a frame to its entities.
+
+        Only frames of known senders are turned into packets.
+        """
+        if frame.packet_type != PACKET_TYPE_RADIO_ERP1:
+            return
+        sender_int = frame.sender_int
+        if replayed:
+            # a replay discovers nothing and leaves the live statistics alone
+            if (entities := self._routes.get(sender_int)) is None:
+                return
+        elif (entities := self._lookup_entities(sender_int)) is None:
+            if (teach_in := parse_teach_in(frame.data)) is not None:
+                self._async_discovered(sender_int, *teach_in)
+            return
+        telegram = Telegram.from_frame(frame, sender_int)
+        # the signal strength of a replay must not choose the transmitter
+        dbm = None if replayed else telegram.dBm
+        if not self._async_merge(sender_int, telegram.payload, telegram.status, dbm):
+            return
+
+        telegram.parsed_at = perf_counter()
+        telegram.received_at = received_at or telegram.parsed_at
+        telegram.latency = self.latency
+        telegram.replayed = replayed
+        if not replayed:
+            self.latency.record(STAGE_PARSE, telegram.parsed_at - telegram.received_at)
+        _LOGGER.debug("Received radio telegram: %s", telegram)
+        for entity in entities:
+            self.hass.async_add_job(entity._message_received_callback, telegram)
+
+    @callback
+    def _async_receive_telegram(self, telegram, entities):
+        """Hand a telegram of the threaded transport to its entities."""
+        self.latency.record(STAGE_LOOP_HOP, perf_counter() - telegram.parsed_at)
+        if not self._async_merge(
+            telegram.sender_int, telegram.payload, telegram.status, telegram.dBm
+        ):
+            return
+        for entity in entities:
+            self.hass.async_add_job(entity._message_received_callback, telegram)
+
+    @callback
+    def _async_discovered(self, sender_int, eep, manufacturer):
+        """Remember a device that sent a teach-in telegram."""
+        self._receivers.pin(sender_int, self)
+        self.hass.data[DATA_ENOCEAN][ENOCEAN_DISCOVERED].async_add(
+            sender_int, eep, manufacturer, self.serial_path
+        )
+
+    @callback
+    def _async_merge(self, sender_int, payload, status, dbm) -> bool:
+        """Return True if the telegram was not delivered yet.
+
+        Copies from repeaters and from the other dongles are dropped, the
+        signal strength of every copy is remembered.
+        """
+        if dbm is not None:
+            self._receivers.heard(sender_int, self, dbm)
+        return not self._receivers.duplicate_filter.is_duplicate(
+            sender_int, payload, status, self
+        )
+
+    # keep this the last method, it shadows homeassistant.core.callback
+    # inside the class body
     def callback(self, packet):
         """Handle EnOcean device's callback.
 
@@ -57,32 +371,263 @@ class EnOceanDongle:
         is an incoming packet.
         """
 
+        if capture := self._capture:
+            capture.write(bytes(packet.build()), getattr(packet, "sender_int", 0))
+
         if isinstance(packet, RadioPacket):
+            # python-enocean parsed the packet already
             _LOGGER.debug("Received radio packet: %s", packet)
-            dispatcher_send(self.hass, SIGNAL_RECEIVE_MESSAGE, packet)
+            entities = self._lookup_entities(packet.sender_int)
+            if entities is None:
+                if (teach_in := parse_teach_in(packet.data)) is not None:
+                    self.hass.loop.call_soon_threadsafe(
+                        self._async_discovered, packet.sender_int, *teach_in
+                    )
+                return
+            telegram = Telegram.from_packet(packet)
+            telegram.received_at = telegram.parsed_at = perf_counter()
+            telegram.latency = self.latency
+            # merge on the loop, the filter is shared with the other dongles
+            self.hass.loop.call_soon_threadsafe(
+                self._async_receive_telegram, telegram, entities
+            )
+
+
+class ReceiverGroup:
+    """The dongles of all config entries.
+
+    Telegrams received by several dongles are delivered once. Commands to
+    a device go out through the dongle it is pinned to.
+
+    Packets are sent with the base id of the dongle, and a device taught
+    in with one base id ignores the others. So a device is pinned to the
+    dongle it was discovered on. Otherwise it is pinned to the dongle
+    chosen for its first command, and stays there when the signal
+    strengths change.
+
+    >>> class Dongle:
+    ...     def __init__(self, serial_path):
+    ...         self.serial_path, self.connected = serial_path, True
+    >>> group, usb0, usb1 = ReceiverGroup(), Dongle("usb0"), Dongle("usb1")
+    >>> group.add(usb0), group.add(usb1)
+    (None, None)
+    >>> group.heard(1, usb0, -80), group.heard(1, usb1, -60)
+    (None, None)
+    >>> group.transmitter(1).serial_path
+    'usb1'
+    >>> group.heard(1, usb0, -50)
+    >>> group.transmitter(1).serial_path
+    'usb1'
+    >>> group.pin(2, usb0)
+    >>> group.heard(2, usb1, -40)
+    >>> group.transmitter(2).serial_path
+    'usb0'
+    """
 
+    def __init__(self):
+        """Initialize the group."""
+        # serial path -> dongle, in order of setup
+        self.dongles = {}
+        self.duplicate_filter = DuplicateFilter()
+        # sender id -> {dongle: (dBm, time)}
+        self._links = {}
+        # sender id -> serial path of its transmitter, kept over reloads
+        self._pins = {}
 
-def detect():
-    """Return a list of candidate paths for USB ENOcean dongles.
+    def add(self, dongle):
+        """Add a set up dongle."""
+        self.dongles[dongle.serial_path] = dongle
 
-    This method is currently a bit simplistic, it may need to be
-    improved to support more configurations and OS.
+    def remove(self, dongle):
+        """Remove a dongle and forget what it heard."""
+        self.dongles.pop(dongle.serial_path, None)
+        for links in self._links.values():
+            links.pop(dongle, None)
+
+    def heard(self, sender_int, dongle, dbm):
+        """Remember the signal strength of a telegram received by dongle."""
+        self._links.setdefault(sender_int, {})[dongle] = (dbm, monotonic())
+
+    def pin(self, sender_int, dongle):
+        """Send to a device through dongle, unless it is pinned already."""
+        self._pins.setdefault(sender_int, dongle.serial_path)
+
+    def transmitter(self, sender_int):
+        """Return the dongle a device is pinned to.
+
+        A pinned dongle is returned even while it reconnects, its queue
+        holds the packets. An unpinned device is pinned to the connected
+        dongle that heard it best recently. Without one it goes to the
+        first connected dongle, or to the first dongle if none is connected.
+        While the pinned dongle is not set up (e.g. during a reload) a
+        dongle is chosen the same way, but not pinned.
+        """
+        if (path := self._pins.get(sender_int)) is not None:
+            if (dongle := self.dongles.get(path)) is not None:
+                return dongle
+            return self._best(sender_int)
+        if (dongle := self._best(sender_int)) is not None:
+            self._pins[sender_int] = dongle.serial_path
+        return dongle
+
+    def _best(self, sender_int):
+        now = monotonic()
+        best = None
+        for dongle, (dbm, heard_at) in self._links.get(sender_int, {}).items():
+            if (
+                dongle.connected
+                and now - heard_at <= LINK_MAX_AGE
+                and (best is None or dbm > best[1])
+            ):
+                best = (dongle, dbm)
+        if best is not None:
+            return best[0]
+        return next(
+            (dongle for dongle in self.dongles.values() if dongle.connected),
+            next(iter(self.dongles.values()), None),
+        )
+
+
+class EnOceanProtocol(asyncio.Protocol):
+    """Read the ESP3 stream of the dongle on the event loop.
+
+    Alternative to the polling thread of python-enocean's SerialCommunicator.
     """
-    globs_to_test = ["/dev/tty*FTOA2PV*", "/dev/serial/by-id/*EnOcean*"]
-    found_paths = []
-    for current_glob in globs_to_test:
-        found_paths.extend(glob.glob(current_glob))
 
-    return found_paths
+    def __init__(self, frame_callback, connection_lost_callback=None):
+        """Initialize the protocol."""
+        self._frame_callback = frame_callback
+        self._connection_lost_callback = connection_lost_callback
+        self._framer = ESP3Framer()
 
+    def data_received(self, data):
+        """Hand all complete frames in the received data to the callback."""
+        received_at = perf_counter()
+        for frame in self._framer.feed(data):
+            self._frame_callback(frame, received_at)
+
+    def connection_lost(self, exc):
+        """Report a lost serial connection."""
+        if exc:
+            _LOGGER.error("Serial connection to EnOcean dongle lost: %s", exc)
+        if self._connection_lost_callback:
+            self._connection_lost_callback()
+
+
+@callback
+def async_register_entity(hass: HomeAssistant, sender_int: int, entity):
+    """Route the telegrams of sender_int to entity.
+
+    The table lives in hass.data, so it survives a reload of the dongle.
+    Values are tuples and only ever replaced, the dongle reads them
+    from its serial thread. Returns a function to remove the route.
+    """
+    routes = hass.data.setdefault(DATA_ENOCEAN, {}).setdefault(ENOCEAN_ROUTES, {})
+    routes[sender_int] = (*routes.get(sender_int, ()), entity)
+
+    @callback
+    def async_unregister():
+        remaining = tuple(e for e in routes.get(sender_int, ()) if e is not entity)
+        if remaining:
+            routes[sender_int] = remaining
+        else:
+            routes.pop(sender_int, None)
+
+    return async_unregister
+
+
+def _is_enocean_port(port) -> bool:
+    """Return True if a port of list_ports is an EnOcean USB dongle."""
+    if (port.vid, port.pid) not in USB_VID_PID:
+        return False
+    names = (port.manufacturer, port.product, port.description)
+    return any(USB_NAME in name.lower() for name in names if name)
 
-def validate_path(path: str):
-    """Return True if the provided path points to a valid serial port, False otherwise."""
+
+def _candidate_ports(exclude):
+    """Return the EnOcean USB ports and their USB serial numbers.
+
+    Blocking, lists the ports of the system. Ports in exclude are left
+    out, also under another name.
+    """
+    by_id = {realpath(path): path for path in glob.glob(SERIAL_BY_ID_GLOB)}
+    devices = {realpath(path) for path in exclude}
+    candidates = {}
+    for port in list_ports.comports():
+        if not _is_enocean_port(port):
+            continue
+        if (device := realpath(port.device)) not in devices:
+            devices.add(device)
+            candidates[by_id.get(device, port.device)] = port.serial_number or ""
+    return candidates
+
+
+def _probe(path: str) -> bool:
+    """Return True if an ESP3 dongle answers a version request on path.
+
+    Blocking, gives up after PROBE_TIMEOUT. The port is opened exclusively,
+    a port in use by another process is skipped.
+    """
+    deadline = monotonic() + PROBE_TIMEOUT
+    framer = ESP3Framer(size=1024)
+    try:
+        with serial.Serial(
+            path, 57600, timeout=0.1, write_timeout=PROBE_TIMEOUT, exclusive=True
+        ) as port:
+            port.reset_input_buffer()
+            port.write(build_frame(PACKET_TYPE_COMMON_COMMAND, [CO_RD_VERSION]))
+            while monotonic() < deadline:
+                for frame in framer.feed(port.read(port.in_waiting or 1)):
+                    if frame.packet_type == PACKET_TYPE_RESPONSE:
+                        return frame.data[0] == RETURN_CODE_OK
+    except (serial.SerialException, OSError) as exception:
+        _LOGGER.debug("Probing %s failed: %s", path, exception)
+    return False
+
+
+async def async_probe(hass: HomeAssistant, path: str) -> bool:
+    """Probe a port in the executor with a hard timeout."""
     try:
-        # Creating the serial communicator will raise an exception
-        # if it cannot connect
-        SerialCommunicator(port=path)
-        return True
-    except serial.SerialException as exception:
-        _LOGGER.warning("Dongle path %s is invalid: %s", path, str(exception))
+        return await asyncio.wait_for(
+            hass.async_add_executor_job(_probe, path), PROBE_TIMEOUT + 1
+        )
+    except asyncio.TimeoutError:
+        # the port hangs on open, the executor thread finishes on its own
+        _LOGGER.debug("Probing %s timed out", path)
+        return False
+
+
+async def async_detect(hass: HomeAssistant, exclude=()) -> list[str]:
+    """Return the paths of the connected ENOcean dongles.
+
+    All candidate ports are probed concurrently. Dongles found are stored
+    by path and USB serial number and not probed again. Ports in exclude
+    (e.g. in use by a config entry) are skipped.
+    """
+    store = Store(hass, PROBE_CACHE_VERSION, PROBE_CACHE_KEY)
+    # older caches held failed probes as well
+    stored = await store.async_load() or {}
+    cache = {key: True for key, found in stored.items() if found}
+    candidates = {
+        f"{path}|{serial_number}": path
+        for path, serial_number in (
+            await hass.async_add_executor_job(_candidate_ports, exclude)
+        ).items()
+    }
+    unknown = [key for key in candidates if key not in cache]
+    results = await asyncio.gather(
+        *(async_probe(hass, candidates[key]) for key in unknown)
+    )
+    if found := [key for key, result in zip(unknown, results) if result]:
+        cache.update(dict.fromkeys(found, True))
+        await store.async_save(cache)
+
+    return [path for key, path in candidates.items() if key in cache]
+
+
+async def async_validate_path(hass: HomeAssistant, path: str) -> bool:
+    """Return True if the provided path points to an ENOcean dongle, False otherwise."""
+    if not await async_probe(hass, path):
+        _LOGGER.warning("Dongle path %s is invalid: no ESP3 response", path)
         return False
+    return True
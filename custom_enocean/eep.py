@@ -0,0 +1,305 @@
+"""Registry of the supported EEPs (EnOcean Equipment Profiles).
+
+Every profile is a table entry: the bit field layout of its data telegram
+and the entity descriptions of the values. The key of a description is
+the name of the field it shows. Profiles without descriptions (multisensor,
+thermostat, rocker switches) have entity classes of their own and only
+share the layout.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import voluptuous as vol
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ELECTRIC_POTENTIAL_VOLT,
+    LIGHT_LUX,
+    PERCENTAGE,
+    TEMP_CELSIUS,
+)
+from homeassistant.helpers.entity import EntityCategory
+
+from .bitfields import BitFields, Field
+from .discovery import format_eep
+
+RORG_RPS = 0xF6
+RORG_1BS = 0xD5
+RORG_4BS = 0xA5
+RORG_VLD = 0xD2
+# signal telegram of the multisensor
+RORG_SIGNAL = 0xD0
+
+
+@dataclass
+class EnOceanBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a binary value of a profile."""
+
+    # the field is set when the sensor is off, e.g. contact closed
+    inverted: bool = False
+
+
+@dataclass(frozen=True)
+class EEPProfile:
+    """Layout and values of an EEP."""
+
+    rorg: int
+    func: int
+    type: int
+    layout: BitFields
+    sensors: tuple[SensorEntityDescription, ...] = ()
+    binary_sensors: tuple[EnOceanBinarySensorEntityDescription, ...] = ()
+    # opt-in sensors of values that change often, e.g. of a thermostat
+    diagnostics: tuple[SensorEntityDescription, ...] = ()
+
+    @property
+    def eep(self) -> str:
+        """Return the EEP in the usual notation, e.g. A5-02-05."""
+        return format_eep(self.rorg, self.func, self.type)
+
+
+# LRN bit of 4BS and 1BS telegrams, cleared in teach-in telegrams
+DATA_TELEGRAM_4BS = Field("data_telegram", 28, 1, flag=True)
+DATA_TELEGRAM_1BS = Field("data_telegram", 4, 1, flag=True)
+
+TEMPERATURE = SensorEntityDescription(
+    key="temperature",
+    name="Temperature",
+    native_unit_of_measurement=TEMP_CELSIUS,
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+HUMIDITY = SensorEntityDescription(
+    key="humidity",
+    name="Humidity",
+    native_unit_of_measurement=PERCENTAGE,
+    device_class=SensorDeviceClass.HUMIDITY,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+ILLUMINATION = SensorEntityDescription(
+    key="illumination",
+    name="Illumination",
+    native_unit_of_measurement=LIGHT_LUX,
+    device_class=SensorDeviceClass.ILLUMINANCE,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+SUPPLY_VOLTAGE = SensorEntityDescription(
+    key="supply_voltage",
+    name="Supply voltage",
+    native_unit_of_measurement=ELECTRIC_POTENTIAL_VOLT,
+    device_class=SensorDeviceClass.VOLTAGE,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+OCCUPANCY = EnOceanBinarySensorEntityDescription(
+    key="occupancy",
+    name="Occupancy",
+    device_class=BinarySensorDeviceClass.OCCUPANCY,
+)
+CONTACT = EnOceanBinarySensorEntityDescription(
+    key="contact",
+    name="Contact",
+    device_class=BinarySensorDeviceClass.OPENING,
+    inverted=True,
+)
+VALVE_POSITION = SensorEntityDescription(
+    key="valve_position",
+    name="Valve position",
+    native_unit_of_measurement=PERCENTAGE,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+# current or feed temperature, depending on the temperature selection
+MEASURED_TEMPERATURE = SensorEntityDescription(
+    key="temperature",
+    name="Measured temperature",
+    native_unit_of_measurement=TEMP_CELSIUS,
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+)
+
+# D2-14-41 multisensor, data telegram
+MULTISENSOR_DATA_FIELDS = BitFields(9, [
+    Field("temperature", 0, 10, 0.1, -40),
+    Field("humidity", 10, 8, 0.5),
+    Field("illumination", 18, 17),
+    Field("acceleration_status", 35, 2),
+    Field("acceleration_x", 37, 10, 0.005, -2.5),
+    Field("acceleration_y", 47, 10, 0.005, -2.5),
+    Field("acceleration_z", 57, 9, 0.005, -2.5),
+])
+
+# A5-20-06 data telegram of the actuator
+THERMOSTAT_DATA_FIELDS = BitFields(4, [
+    Field("valve_position", 0, 8),
+    Field("local_offset_mode", 8, 1, flag=True),
+    Field("target_temperature", 9, 7, 0.5),
+    Field("temperature", 16, 8, 0.5),
+    Field("tslmode", 24, 1, flag=True),
+    Field("harvesting_active", 25, 1, flag=True),
+    Field("chargelevel_ok", 26, 1, flag=True),
+    Field("window_open", 27, 1, flag=True),
+    DATA_TELEGRAM_4BS,
+    Field("communication_error", 29, 1, flag=True),
+    Field("signalstrength_error", 30, 1, flag=True),
+    Field("actuator_error", 31, 1, flag=True),
+])
+
+# 4BS teach-in telegram (variant 2)
+TEACH_IN_4BS_FIELDS = BitFields(4, [
+    Field("function", 0, 6),
+    Field("type", 6, 7),
+    Field("manufacturer_id", 13, 11),
+])
+
+# F6-02 rocker switch, first and second action
+ROCKER_FIELDS = BitFields(1, [
+    Field("rocker_action", 0, 3),
+    Field("energy_bow", 3, 1, flag=True),
+    Field("second_action", 4, 3),
+    Field("second_action_valid", 7, 1, flag=True),
+])
+
+# A5-02 types: temperature range, 8 bit 255..0 or 10 bit 1023..0
+A5_02_RANGES = {
+    0x01: (-40, 0), 0x02: (-30, 10), 0x03: (-20, 20), 0x04: (-10, 30),
+    0x05: (0, 40), 0x06: (10, 50), 0x07: (20, 60), 0x08: (30, 70),
+    0x09: (40, 80), 0x0A: (50, 90), 0x0B: (60, 100),
+    0x10: (-60, 20), 0x11: (-50, 30), 0x12: (-40, 40), 0x13: (-30, 50),
+    0x14: (-20, 60), 0x15: (-10, 70), 0x16: (0, 80), 0x17: (10, 90),
+    0x18: (20, 100), 0x19: (30, 110), 0x1A: (40, 120), 0x1B: (50, 130),
+    0x20: (-10, 41.2), 0x30: (-40, 62.3),
+}
+
+
+def _a5_02(eep_type, low, high):
+    """Return the profile of a temperature sensor, the raw value is inverted."""
+    if eep_type >= 0x20:
+        offset, size = 14, 10
+    else:
+        offset, size = 16, 8
+    scale = (high - low) / ((1 << size) - 1)
+    return EEPProfile(
+        RORG_4BS, 0x02, eep_type,
+        BitFields(4, [Field("temperature", offset, size, -scale, high), DATA_TELEGRAM_4BS]),
+        sensors=(TEMPERATURE,),
+    )
+
+
+PROFILES = [
+    *(_a5_02(eep_type, *limits) for eep_type, limits in A5_02_RANGES.items()),
+    # temperature and humidity
+    EEPProfile(
+        RORG_4BS, 0x04, 0x01,
+        BitFields(4, [
+            Field("humidity", 8, 8, 0.4),
+            Field("temperature", 16, 8, 0.16),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(TEMPERATURE, HUMIDITY),
+    ),
+    EEPProfile(
+        RORG_4BS, 0x04, 0x02,
+        BitFields(4, [
+            Field("humidity", 8, 8, 0.4),
+            Field("temperature", 16, 8, 0.32, -20),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(TEMPERATURE, HUMIDITY),
+    ),
+    EEPProfile(
+        RORG_4BS, 0x04, 0x03,
+        BitFields(4, [
+            Field("humidity", 0, 8, 100 / 255),
+            Field("temperature", 14, 10, 80 / 1023, -20),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(TEMPERATURE, HUMIDITY),
+    ),
+    # occupancy
+    EEPProfile(
+        RORG_4BS, 0x07, 0x01,
+        BitFields(4, [
+            Field("supply_voltage", 0, 8, 0.02),
+            # PIR status 128..255 is on
+            Field("occupancy", 16, 1, flag=True),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(SUPPLY_VOLTAGE,),
+        binary_sensors=(OCCUPANCY,),
+    ),
+    EEPProfile(
+        RORG_4BS, 0x07, 0x02,
+        BitFields(4, [
+            Field("supply_voltage", 0, 8, 0.02),
+            Field("occupancy", 24, 1, flag=True),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(SUPPLY_VOLTAGE,),
+        binary_sensors=(OCCUPANCY,),
+    ),
+    EEPProfile(
+        RORG_4BS, 0x07, 0x03,
+        BitFields(4, [
+            Field("supply_voltage", 0, 8, 0.02),
+            Field("illumination", 8, 10),
+            Field("occupancy", 24, 1, flag=True),
+            DATA_TELEGRAM_4BS,
+        ]),
+        sensors=(SUPPLY_VOLTAGE, ILLUMINATION),
+        binary_sensors=(OCCUPANCY,),
+    ),
+    # single input contact, set when closed
+    EEPProfile(
+        RORG_1BS, 0x00, 0x01,
+        BitFields(1, [Field("contact", 7, 1, flag=True), DATA_TELEGRAM_1BS]),
+        binary_sensors=(CONTACT,),
+    ),
+    EEPProfile(RORG_VLD, 0x14, 0x41, MULTISENSOR_DATA_FIELDS),
+    EEPProfile(
+        RORG_4BS, 0x20, 0x06,
+        THERMOSTAT_DATA_FIELDS,
+        diagnostics=(VALVE_POSITION, MEASURED_TEMPERATURE),
+    ),
+    EEPProfile(RORG_RPS, 0x02, 0x01, ROCKER_FIELDS),
+    EEPProfile(RORG_RPS, 0x02, 0x02, ROCKER_FIELDS),
+]
+
+EEP_PROFILES: dict[tuple[int, int, int], EEPProfile] = {
+    (profile.rorg, profile.func, profile.type): profile for profile in PROFILES
+}
+
+
+def parse_eep(eep: str) -> tuple[int, int, int]:
+    """Return rorg, func and type of an EEP like A5-02-05.
+
+    >>> parse_eep("a5-02-05")
+    (165, 2, 5)
+    """
+    rorg, func, eep_type = (int(part, 16) for part in eep.split("-"))
+    return rorg, func, eep_type
+
+
+def get_profile(eep: str) -> EEPProfile | None:
+    """Return the profile of an EEP, None if it is not supported."""
+    try:
+        return EEP_PROFILES.get(parse_eep(eep))
+    except ValueError:
+        return None
+
+
+def validate_eep(value):
+    """Validate a supported EEP with entity descriptions, for the yaml schemas."""
+    profile = get_profile(str(value))
+    if profile is None or not (profile.sensors or profile.binary_sensors):
+        raise vol.Invalid(f"unsupported EEP: {value}")
+    return profile.eep
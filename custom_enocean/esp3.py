@@ -0,0 +1,167 @@
+"""Framer for the ESP3 serial protocol spoken by EnOcean dongles.
+
+Received bytes are kept in one preallocated buffer, frames are handed out
+as memoryview slices of it instead of lists of ints.
+"""
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+SYNC_BYTE = 0x55
+# sync byte, data length (2), optional length, packet type, header crc
+HEADER_LENGTH = 6
+MAX_FRAME_LENGTH = HEADER_LENGTH + 0xFFFF + 0xFF + 1
+
+PACKET_TYPE_RADIO_ERP1 = 0x01
+PACKET_TYPE_RESPONSE = 0x02
+PACKET_TYPE_COMMON_COMMAND = 0x05
+
+RETURN_CODE_OK = 0x00
+
+
+def _build_crc8_table():
+    """Return the lookup table of the CRC8 (polynomial 0x07) used by ESP3."""
+    table = bytearray(256)
+    for index in range(256):
+        crc = index
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[index] = crc
+    return bytes(table)
+
+
+CRC8_TABLE = _build_crc8_table()
+
+
+def crc8(data) -> int:
+    """Return the CRC8 of data (bytes, bytearray or memoryview)."""
+    crc = 0
+    table = CRC8_TABLE
+    for byte in data:
+        crc = table[crc ^ byte]
+    return crc
+
+
+def build_frame(packet_type: int, data, optional=b"") -> bytes:
+    """Return a complete ESP3 frame."""
+    header = bytes((len(data) >> 8, len(data) & 0xFF, len(optional), packet_type))
+    body = bytes(data) + bytes(optional)
+    return (
+        bytes((SYNC_BYTE,))
+        + header
+        + bytes((crc8(header),))
+        + body
+        + bytes((crc8(body),))
+    )
+
+
+class ESP3Frame:
+    """A received frame, the fields are views into the framer's buffer.
+
+    The views are only valid until the framer is fed again, copy them
+    (bytes(frame.data)) to keep them.
+    """
+
+    __slots__ = ("packet_type", "data", "optional", "raw")
+
+    def __init__(self, packet_type, data, optional, raw):
+        """Initialize the frame."""
+        self.packet_type = packet_type
+        self.data = data
+        self.optional = optional
+        self.raw = raw
+
+    @property
+    def sender_int(self) -> int:
+        """Return the sender id of an ERP1 radio frame.
+
+        The sender id is followed by the status byte at the end of the data.
+        """
+        return int.from_bytes(self.data[-5:-1], "big")
+
+
+class ESP3Framer:
+    """Split the byte stream of a dongle into ESP3 frames.
+
+    Invalid bytes are skipped by searching for the next sync byte, the
+    buffer is allocated once and compacted in place.
+    """
+
+    def __init__(self, size=2 * MAX_FRAME_LENGTH):
+        """Initialize the framer."""
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        # unparsed data is self._buffer[self._start:self._end]
+        self._start = 0
+        self._end = 0
+        self.crc_errors = 0
+
+    def _append(self, data):
+        size = len(self._buffer)
+        length = len(data)
+        if self._end + length > size:
+            # move the unparsed rest to the front, memoryview copies with memmove
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start : self._end]
+            self._start, self._end = 0, pending
+        if self._end + length > size:
+            _LOGGER.warning("ESP3 buffer overflow, dropping %s bytes", self._end)
+            self._start = self._end = 0
+            data = data[-size:]
+            length = len(data)
+        self._view[self._end : self._end + length] = data
+        self._end += length
+
+    def feed(self, data):
+        """Add received bytes and yield all complete frames.
+
+        The returned generator has to be exhausted before feeding again.
+        """
+        self._append(data)
+        buffer = self._buffer
+        view = self._view
+        table = CRC8_TABLE
+        start = self._start
+        end = self._end
+        while True:
+            start = buffer.find(SYNC_BYTE, start, end)
+            if start < 0:
+                start = end
+                break
+            if end - start < HEADER_LENGTH:
+                break
+
+            crc = 0
+            for byte in view[start + 1 : start + 5]:
+                crc = table[crc ^ byte]
+            if crc != buffer[start + 5]:
+                # not a header, resync on the next sync byte
+                self.crc_errors += 1
+                start += 1
+                continue
+
+            data_end = start + HEADER_LENGTH + (buffer[start + 1] << 8 | buffer[start + 2])
+            frame_end = data_end + buffer[start + 3] + 1
+            if frame_end > end:
+                break
+
+            crc = 0
+            for byte in view[start + HEADER_LENGTH : frame_end - 1]:
+                crc = table[crc ^ byte]
+            if crc != buffer[frame_end - 1]:
+                self.crc_errors += 1
+                start += 1
+                continue
+
+            self._start = frame_end
+            yield ESP3Frame(
+                buffer[start + 4],
+                view[start + HEADER_LENGTH : data_end],
+                view[data_end : frame_end - 1],
+                view[start:frame_end],
+            )
+            start = frame_end
+
+        self._start = start
+        if start == end:
+            self._start = self._end = 0
@@ -0,0 +1,141 @@
+"""Tilt, vibration and orientation detection from acceleration samples."""
+from array import array
+from math import acos, degrees, sqrt
+
+DEFAULT_BUFFER_SIZE = 32
+DEFAULT_TILT_ANGLE = 10.0
+DEFAULT_VIBRATION = 0.05
+# magnitude (g) of an axis that points along gravity
+ORIENTATION_THRESHOLD = 0.7
+
+MOTION_TILT = "tilt"
+MOTION_VIBRATION = "vibration"
+MOTION_ORIENTATION = "orientation"
+
+
+class AccelerationBuffer:
+    """The magnitudes of the last acceleration samples in a fixed array.
+
+    Keeps the sum and sum of squares of the magnitudes in the buffer, the
+    standard deviation is O(1) per sample.
+    """
+
+    def __init__(self, size=DEFAULT_BUFFER_SIZE):
+        """Initialize the buffer."""
+        self.size = size
+        self.magnitude = array("d", bytes(8 * size))
+        self.count = 0
+        self._next = 0
+        self._sum = 0.0
+        self._squares = 0.0
+
+    def append(self, x, y, z) -> float:
+        """Add a sample, return its magnitude."""
+        position = self._next
+        magnitude = sqrt(x * x + y * y + z * z)
+        if self.count == self.size:
+            old = self.magnitude[position]
+            self._sum -= old
+            self._squares -= old * old
+        else:
+            self.count += 1
+        self.magnitude[position] = magnitude
+        self._sum += magnitude
+        self._squares += magnitude * magnitude
+        self._next = (position + 1) % self.size
+        return magnitude
+
+    def stddev(self) -> float:
+        """Return the standard deviation of the magnitudes in the buffer."""
+        if self.count < 2:
+            return 0.0
+        mean = self._sum / self.count
+        # rounding can make it slightly negative
+        return sqrt(max(self._squares / self.count - mean * mean, 0.0))
+
+
+def orientation(x, y, z):
+    """Return the axis pointing along gravity, e.g. "z-", None if unclear.
+
+    >>> orientation(0.02, -0.05, -0.98)
+    'z-'
+    >>> orientation(0.5, 0.5, 0.5) is None
+    True
+    """
+    axis, value = max(zip("xyz", (x, y, z)), key=lambda item: abs(item[1]))
+    if abs(value) < ORIENTATION_THRESHOLD:
+        return None
+    return axis + ("+" if value > 0 else "-")
+
+
+class MotionDetector:
+    """Incremental detectors on an acceleration buffer.
+
+    add returns the events of a sample as (type, data) pairs:
+    - tilt: the angle to the first sample crossed tilt_angle (degrees),
+      it is reset below half of it
+    - vibration: the standard deviation of the magnitude in the buffer
+      exceeded vibration (g), it ends below half of it
+    - orientation: another axis points along gravity
+
+    >>> detector = MotionDetector(size=4)
+    >>> detector.add(0.0, 0.0, -1.0)
+    [('orientation', {'orientation': 'z-', 'previous': None})]
+    >>> detector.add(0.0, 0.26, -0.97)
+    [('tilt', {'tilted': True, 'angle': 15.0})]
+    """
+
+    def __init__(
+        self,
+        size=DEFAULT_BUFFER_SIZE,
+        tilt_angle=DEFAULT_TILT_ANGLE,
+        vibration=DEFAULT_VIBRATION,
+    ):
+        """Initialize the detectors."""
+        self.buffer = AccelerationBuffer(size)
+        self.tilt_angle = tilt_angle
+        self.vibration = vibration
+        self._reference = None
+        self._tilted = False
+        self._vibrating = False
+        self._orientation = None
+
+    def add(self, x, y, z, status=0):
+        """Add a sample, return the events it caused."""
+        magnitude = self.buffer.append(x, y, z)
+        events = []
+
+        if (current := orientation(x, y, z)) is not None and current != self._orientation:
+            events.append(
+                (MOTION_ORIENTATION, {"orientation": current, "previous": self._orientation})
+            )
+            self._orientation = current
+
+        if self._reference is None:
+            if magnitude:
+                self._reference = (x / magnitude, y / magnitude, z / magnitude)
+        elif magnitude:
+            cosine = (
+                x * self._reference[0] + y * self._reference[1] + z * self._reference[2]
+            ) / magnitude
+            angle = degrees(acos(max(-1.0, min(1.0, cosine))))
+            limit = self.tilt_angle if not self._tilted else self.tilt_angle / 2
+            if (angle >= limit) != self._tilted:
+                self._tilted = not self._tilted
+                events.append((MOTION_TILT, {"tilted": self._tilted, "angle": round(angle, 1)}))
+
+        stddev = self.buffer.stddev()
+        limit = self.vibration if not self._vibrating else self.vibration / 2
+        if (stddev >= limit) != self._vibrating:
+            self._vibrating = not self._vibrating
+            events.append(
+                (
+                    MOTION_VIBRATION,
+                    {
+                        "vibrating": self._vibrating,
+                        "stddev": round(stddev, 3),
+                        "status": status,
+                    },
+                )
+            )
+        return events
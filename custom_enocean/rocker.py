@@ -0,0 +1,143 @@
+"""F6-02 rocker switches: buttons, press and release, long press, double click."""
+from __future__ import annotations
+
+from .eep import ROCKER_FIELDS
+
+# seconds, measured between the receive times of the telegrams
+LONG_PRESS = 0.8
+DOUBLE_CLICK = 0.4
+
+# button numbers of the telegram, rocker A and B, I (1) and O (0)
+BUTTONS = ("A1", "A0", "B1", "B0")
+# a U-message tells the number of buttons only
+CHANNEL_ALL = "all"
+
+ACTION_PRESS = "press"
+ACTION_RELEASE = "release"
+ACTION_CLICK = "click"
+ACTION_LONG_PRESS = "long_press"
+ACTION_DOUBLE_CLICK = "double_click"
+
+# status bit: N-message (buttons given) or U-message (number of buttons)
+STATUS_NU = 0x10
+
+
+def decode_rocker(payload, status) -> tuple[bool, tuple[str, ...]]:
+    """Return whether buttons are pressed and which.
+
+    >>> decode_rocker(bytes([0x30]), 0x30)
+    (True, ('A0',))
+    >>> decode_rocker(bytes([0x15]), 0x30)
+    (True, ('A1', 'B1'))
+    >>> decode_rocker(bytes([0x00]), 0x20)
+    (False, ())
+    >>> decode_rocker(bytes([0x70]), 0x20)
+    (True, ('all',))
+    """
+    values = ROCKER_FIELDS.decode(payload)
+    if values is None:
+        return False, ()
+    pressed = values["energy_bow"]
+    if not status & STATUS_NU:
+        # 3 or 4 buttons pressed at once, or all released
+        if pressed and values["rocker_action"] == 3:
+            return True, (CHANNEL_ALL,)
+        return pressed, ()
+    buttons = (BUTTONS[values["rocker_action"]],)
+    if values["second_action_valid"]:
+        buttons += (BUTTONS[values["second_action"]],)
+    return pressed, buttons
+
+
+def channel(button: str) -> str:
+    """Return the channel (rocker) of a button, e.g. a for A0."""
+    return button[0].lower() if button != CHANNEL_ALL else CHANNEL_ALL
+
+
+class RockerStateMachine:
+    """Turn presses and releases into actions, without timers.
+
+    A long press is told apart from a click on release, a double click
+    on the second press. Every press telegram starts a new gesture, copies
+    from repeaters are dropped by the dongle already. If a release was
+    lost, the next press replaces the pending one. handle returns
+    (channel, data) per event.
+
+    >>> rocker = RockerStateMachine()
+    >>> [data["action"] for _, data in rocker.handle(True, ("A0",), 0.0)]
+    ['press']
+    >>> [data["action"] for _, data in rocker.handle(False, (), 0.1)]
+    ['release', 'click']
+    >>> [data["action"] for _, data in rocker.handle(True, ("A0",), 0.3)]
+    ['press', 'double_click']
+    >>> [data["action"] for _, data in rocker.handle(False, (), 1.2)]
+    ['release', 'long_press']
+    >>> [data["action"] for _, data in rocker.handle(True, ("B1",), 2.0)]
+    ['press']
+    >>> [data["action"] for _, data in rocker.handle(True, ("B1",), 5.0)]
+    ['press']
+    >>> [(d["action"], d["duration"]) for _, d in rocker.handle(False, (), 5.1)]
+    [('release', 0.1), ('click', 0.1)]
+    """
+
+    def __init__(self):
+        """Initialize the state machine."""
+        self._pressed = ()
+        self._pressed_at = None
+        # buttons and time of the last click, for double clicks
+        self._clicked = ()
+        self._clicked_at = None
+
+    def handle(self, pressed, buttons, now):
+        """Return the events of a telegram received at now."""
+        events = []
+        if pressed:
+            if not buttons:
+                # 3 or more buttons, not told which
+                return events
+            self._pressed = buttons
+            self._pressed_at = now
+            double = (
+                buttons == self._clicked
+                and self._clicked_at is not None
+                and now - self._clicked_at <= DOUBLE_CLICK
+            )
+            events.extend(self._events(buttons, ACTION_PRESS))
+            if double:
+                self._clicked = ()
+                events.extend(self._events(buttons, ACTION_DOUBLE_CLICK))
+            return events
+
+        if not self._pressed:
+            return events
+        buttons, self._pressed = self._pressed, ()
+        duration = round(now - self._pressed_at, 3)
+        events.extend(self._events(buttons, ACTION_RELEASE, duration))
+        if duration >= LONG_PRESS:
+            self._clicked = ()
+            events.extend(self._events(buttons, ACTION_LONG_PRESS, duration))
+        else:
+            self._clicked = buttons
+            self._clicked_at = now
+            events.extend(self._events(buttons, ACTION_CLICK, duration))
+        return events
+
+    @staticmethod
+    def _events(buttons, action, duration=None):
+        """Return one event per channel of buttons."""
+        both = len(buttons) > 1
+        channels = {}
+        for button in buttons:
+            channels.setdefault(channel(button), []).append(button)
+        return [
+            (
+                name,
+                {
+                    "action": action,
+                    "buttons": channel_buttons,
+                    "both": both,
+                    "duration": duration,
+                },
+            )
+            for name, channel_buttons in channels.items()
+        ]
@@ -3,8 +3,9 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from operator import attrgetter
 
-from enocean.utils import combine_hex, to_bitarray, from_bitarray
+from enocean.utils import combine_hex
 import voluptuous as vol
 import logging
 
@@ -15,27 +16,52 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    CONF_DEVICE,
     CONF_DEVICE_CLASS,
     CONF_ID,
     CONF_NAME,
+    LIGHT_LUX,
     PERCENTAGE,
     POWER_WATT,
     STATE_CLOSED,
     STATE_OPEN,
-    TEMP_CELSIUS
+    TEMP_CELSIUS,
+    TIME_MILLISECONDS,
+    TIME_SECONDS,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import (
     AddEntitiesCallback, AddEntitiesCallback)
-#from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
-from .device import EnOceanEntity
+from .climate import ExternalTemperatureLink
+from .device import CachedAttributes, EnOceanEntity, async_get_coalescer
 from .const import (
-    DOMAIN)
+    CONF_DIAGNOSTIC_ENTITIES,
+    CONF_EEP,
+    DATA_ENOCEAN,
+    DOMAIN,
+    EEP_MULTISENSOR,
+    EVENT_MOTION,
+    ENOCEAN_DISCOVERED,
+    ENOCEAN_RECEIVERS,
+    SIGNAL_DEVICE_DISCOVERED)
+from .aggregate import STATS, WindowAggregator
+from .deadband import DEFAULT_MAX_SILENCE, DeadbandFilter
+from .eep import MULTISENSOR_DATA_FIELDS, RORG_SIGNAL, RORG_VLD, get_profile, validate_eep
+from .motion import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_TILT_ANGLE,
+    DEFAULT_VIBRATION,
+    MotionDetector,
+)
+from .stats import STAGES
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "EnOcean sensor"
@@ -47,6 +73,23 @@ SENSOR_TYPE_MULTI = "multi"
 
 EVENT_NEW_DATA = "multisensor-new_data"
 
+CONF_DEADBAND = "deadband"
+CONF_MAX_SILENCE = "max_silence"
+# values of the multisensor that can have a deadband
+DEADBAND_KEYS = ("temperature", "humidity", "illumination", "acceleration")
+
+CONF_AGGREGATE = "aggregate"
+CONF_WINDOW = "window"
+CONF_FIELDS = "fields"
+CONF_AGGREGATE_ONLY = "aggregate_only"
+# values of the multisensor that can be aggregated
+AGGREGATE_FIELDS = ("temperature", "humidity", "illumination")
+
+CONF_MOTION = "motion"
+CONF_BUFFER_SIZE = "buffer_size"
+CONF_TILT_ANGLE = "tilt_angle"
+CONF_VIBRATION = "vibration"
+
 
 @dataclass
 class EnOceanSensorEntityDescriptionMixin:
@@ -85,20 +128,159 @@ SENSOR_DESC_HUMIDITY = EnOceanSensorEntityDescription(
 SENSOR_DESC_BRIGHTNESS = EnOceanSensorEntityDescription(
     key=SENSOR_TYPE_HUMIDITY,
     name="Brightness",
-    native_unit_of_measurement=PERCENTAGE,
+    native_unit_of_measurement=LIGHT_LUX,
     icon="mdi:sun-wireless",
     device_class=SensorDeviceClass.ILLUMINANCE,
     state_class=SensorStateClass.MEASUREMENT,
     unique_id=lambda dev_id: f"{combine_hex(dev_id)}-{SENSOR_TYPE_BRIGHTNESS}",
 )
 
+SENSOR_DESC_ENERGY_STATUS = EnOceanSensorEntityDescription(
+    key="energy_status",
+    name="Energy status",
+    native_unit_of_measurement=PERCENTAGE,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    unique_id=lambda dev_id: f"{combine_hex(dev_id)}-energy_status",
+)
+
+SENSOR_DESC_HARVESTER_DELIVERY = EnOceanSensorEntityDescription(
+    key="harvester_delivery",
+    name="Harvester delivery",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    unique_id=lambda dev_id: f"{combine_hex(dev_id)}-harvester_delivery",
+)
+
+SENSOR_DESC_BACKUP_ENERGY = EnOceanSensorEntityDescription(
+    key="backup_energy",
+    name="Backup energy",
+    native_unit_of_measurement=PERCENTAGE,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    unique_id=lambda dev_id: f"{combine_hex(dev_id)}-backup_energy",
+)
+
+# values of signal telegrams, attributes or diagnostic entities
+MULTISENSOR_SIGNAL_DESCRIPTIONS = {
+    "energy status": SENSOR_DESC_ENERGY_STATUS,
+    "harvester delivery": SENSOR_DESC_HARVESTER_DELIVERY,
+    "backup energy": SENSOR_DESC_BACKUP_ENERGY,
+}
+
+MULTISENSOR_DESCRIPTIONS = {
+    "temperature": SENSOR_DESC_TEMPERATURE,
+    "humidity": SENSOR_DESC_HUMIDITY,
+    "illumination": SENSOR_DESC_BRIGHTNESS,
+}
+
+
+@dataclass
+class EnOceanDongleSensorEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[object], float | int]
+
+
+@dataclass
+class EnOceanDongleSensorEntityDescription(
+    SensorEntityDescription, EnOceanDongleSensorEntityDescriptionMixin
+):
+    """Describes a diagnostic sensor of the dongle."""
+
+
+DONGLE_SENSOR_DESCRIPTIONS = (
+    EnOceanDongleSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        icon="mdi:usb-port",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda usb_dongle: usb_dongle.reconnects,
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="downtime",
+        name="Downtime",
+        icon="mdi:lan-disconnect",
+        native_unit_of_measurement=TIME_SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda usb_dongle: round(usb_dongle.downtime),
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="transmit_queue",
+        name="Transmit queue",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda usb_dongle: usb_dongle.transmit_queue.depth,
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="transmit_queue_max",
+        name="Transmit queue maximum",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda usb_dongle: usb_dongle.transmit_queue.max_depth,
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="deadline_misses",
+        name="Transmit deadline misses",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda usb_dongle: usb_dongle.transmit_queue.deadline_misses,
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="overflows",
+        name="Transmit queue overflows",
+        icon="mdi:tray-remove",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda usb_dongle: usb_dongle.transmit_queue.overflows,
+    ),
+    EnOceanDongleSensorEntityDescription(
+        key="write_errors",
+        name="Transmit write errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda usb_dongle: usb_dongle.transmit_queue.write_errors,
+    ),
+)
+
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_ID): vol.All(cv.ensure_list, [vol.Coerce(int)]),
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Optional(CONF_DEVICE_CLASS, default=SENSOR_TYPE_MULTI): cv.string,
-        vol.Optional("climate-id", default=""): cv.string
+        vol.Optional("climate-id", default=""): cv.string,
+        # any profile of the registry, instead of the multisensor
+        vol.Optional(CONF_EEP): validate_eep,
+        # minimum change of a value for a state write
+        vol.Optional(CONF_DEADBAND, default={}): {
+            vol.Optional(key): vol.All(vol.Coerce(float), vol.Range(min=0))
+            for key in DEADBAND_KEYS
+        },
+        # seconds after which the state is written even without changes, 0 = never
+        vol.Optional(CONF_MAX_SILENCE, default=DEFAULT_MAX_SILENCE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        # min, max and mean over windows of seconds
+        vol.Optional(CONF_AGGREGATE): {
+            vol.Required(CONF_WINDOW): vol.All(vol.Coerce(float), vol.Range(min=1)),
+            vol.Optional(CONF_FIELDS, default=list(AGGREGATE_FIELDS)): vol.All(
+                cv.ensure_list, [vol.In(AGGREGATE_FIELDS)]
+            ),
+            # no entities for the raw values of the aggregated fields
+            vol.Optional(CONF_AGGREGATE_ONLY, default=False): cv.boolean,
+        },
+        # tilt, vibration and orientation events from the acceleration
+        vol.Optional(CONF_MOTION): {
+            vol.Optional(CONF_BUFFER_SIZE, default=DEFAULT_BUFFER_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=2, max=1024)
+            ),
+            vol.Optional(CONF_TILT_ANGLE, default=DEFAULT_TILT_ANGLE): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=180)
+            ),
+            vol.Optional(CONF_VIBRATION, default=DEFAULT_VIBRATION): vol.All(
+                vol.Coerce(float), vol.Range(min=0.005)
+            ),
+        },
+        # sensors instead of attributes for the values of signal telegrams
+        vol.Optional(CONF_DIAGNOSTIC_ENTITIES, default=False): cv.boolean,
     }
 )
 
@@ -110,23 +292,157 @@ def setup_platform(
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up an EnOcean sensor device."""
+    if discovery_info is not None:
+        # diagnostic entities of a thermostat
+        add_entities(
+            create_eep_diagnostics(
+                discovery_info[CONF_ID], discovery_info[CONF_NAME], discovery_info[CONF_EEP]
+            )
+        )
+        return
+
     dev_id = config[CONF_ID]
     dev_name = config[CONF_NAME]
     sensor_type = config[CONF_DEVICE_CLASS]
     climate_id = config["climate-id"]
 
-    if sensor_type == SENSOR_TYPE_MULTI:
-        multisensor = EnOceanMultiSensor(dev_id, dev_name, climate_id)
+    if CONF_EEP in config:
+        add_entities(create_eep_sensors(dev_id, dev_name, config[CONF_EEP]))
+    elif sensor_type == SENSOR_TYPE_MULTI:
+        add_entities(
+            create_multisensor(
+                dev_id,
+                dev_name,
+                climate_id,
+                DeadbandFilter(
+                    _expand_deadbands(config[CONF_DEADBAND]), config[CONF_MAX_SILENCE]
+                ),
+                config.get(CONF_AGGREGATE),
+                config.get(CONF_MOTION),
+                config[CONF_DIAGNOSTIC_ENTITIES],
+            )
+        )
+
+
+def _expand_deadbands(deadbands):
+    """Apply the acceleration deadband to each axis."""
+    deadbands = dict(deadbands)
+    if "acceleration" in deadbands:
+        acceleration = deadbands.pop("acceleration")
+        for axis in ("x", "y", "z"):
+            deadbands[f"acceleration_{axis}"] = acceleration
+    return deadbands
+
+
+def create_multisensor(
+    dev_id,
+    dev_name,
+    climate_id,
+    deadband=None,
+    aggregate=None,
+    motion=None,
+    diagnostic_entities=False,
+):
+    """Return the entities of a multisensor."""
+    aggregator = None
+    raw_fields = AGGREGATE_FIELDS
+    if aggregate is not None:
+        aggregator = WindowAggregator(aggregate[CONF_WINDOW], aggregate[CONF_FIELDS])
+        if aggregate[CONF_AGGREGATE_ONLY]:
+            raw_fields = [
+                field for field in AGGREGATE_FIELDS if field not in aggregator.fields
+            ]
+    motion_detector = None
+    if motion is not None:
+        motion_detector = MotionDetector(
+            motion[CONF_BUFFER_SIZE], motion[CONF_TILT_ANGLE], motion[CONF_VIBRATION]
+        )
+    multisensor = EnOceanMultiSensor(
+        dev_id,
+        dev_name,
+        climate_id,
+        deadband,
+        aggregator,
+        motion_detector,
+        diagnostic_entities,
+    )
+
+    entities = [multisensor]
+    for field in raw_fields:
+        child = MultiSensorSubelement(
+            multisensor, dev_id, dev_name, field, MULTISENSOR_DESCRIPTIONS[field])
+        multisensor.add_child(child)
+        entities.append(child)
+    if aggregator is not None:
+        for field in aggregator.fields:
+            for stat in STATS:
+                child = MultiSensorAggregate(
+                    multisensor, dev_id, dev_name, field, stat,
+                    MULTISENSOR_DESCRIPTIONS[field])
+                multisensor.add_aggregate_child(child)
+                entities.append(child)
+    if diagnostic_entities:
+        for description in MULTISENSOR_SIGNAL_DESCRIPTIONS.values():
+            child = MultiSensorSubelement(
+                multisensor, dev_id, dev_name, description.key, description)
+            multisensor.add_signal_child(child)
+            entities.append(child)
+    return entities
+
+
+def create_eep_sensors(dev_id, dev_name, eep):
+    """Return the sensors of a profile of the EEP registry."""
+    if (profile := get_profile(eep)) is None:
+        return []
+    return [
+        EnOceanEEPSensor(dev_id, dev_name, profile, description)
+        for description in profile.sensors
+    ]
+
+
+def create_eep_diagnostics(dev_id, dev_name, eep):
+    """Return the diagnostic sensors of a profile of the EEP registry."""
+    if (profile := get_profile(eep)) is None:
+        return []
+    return [
+        EnOceanEEPSensor(dev_id, dev_name, profile, description)
+        for description in profile.diagnostics
+    ]
+
+
+def create_discovered(device):
+    """Return the sensors of a discovered device."""
+    if device.eep == EEP_MULTISENSOR:
+        return create_multisensor(device.dev_id, device.name, "")
+    return create_eep_sensors(device.dev_id, device.name, device.eep)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the diagnostic sensors of a dongle and of its discovered devices."""
+    serial_path = config_entry.data[CONF_DEVICE]
+    usb_dongle = hass.data[DATA_ENOCEAN][ENOCEAN_RECEIVERS].dongles[serial_path]
+    discovered = hass.data[DATA_ENOCEAN][ENOCEAN_DISCOVERED]
+
+    entities = [EnOceanLatencySensor(usb_dongle, stage) for stage in STAGES] + [
+        EnOceanDongleSensor(usb_dongle, description)
+        for description in DONGLE_SENSOR_DESCRIPTIONS
+    ]
+    for device in discovered.for_dongle(serial_path):
+        entities.extend(create_discovered(device))
+    async_add_entities(entities)
+
+    @callback
+    def async_device_discovered(device):
+        if device.dongle == serial_path and (entities := create_discovered(device)):
+            async_add_entities(entities)
 
-        add_entities([
-            multisensor,
-            MultiSensorSubelement(
-                multisensor, dev_id, dev_name, 'temperature', SENSOR_DESC_TEMPERATURE),
-            MultiSensorSubelement(multisensor, dev_id,
-                                  dev_name, 'humidity', SENSOR_DESC_HUMIDITY),
-            MultiSensorSubelement(
-                multisensor, dev_id, dev_name, 'illumination', SENSOR_DESC_BRIGHTNESS)
-        ])
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_DISCOVERED, async_device_discovered)
+    )
 
 
 class EnOceanSensor(EnOceanEntity, RestoreEntity):
@@ -162,11 +478,36 @@ class EnOceanMultiSensor(EnOceanSensor, SensorEntity):
         self,
         dev_id,
         dev_name,
-        climate_id
+        climate_id,
+        deadband: DeadbandFilter | None = None,
+        aggregator: WindowAggregator | None = None,
+        motion: MotionDetector | None = None,
+        diagnostic_entities=False
     ):
 
         self._attr_name = dev_name
         self._climate_id = climate_id
+        # feeds the temperature to the thermostat
+        self._climate_link = ExternalTemperatureLink(climate_id) if climate_id else None
+        self._deadband = deadband or DeadbandFilter()
+        # sub-entities, their values are pushed after a data telegram
+        self._children = []
+        # statistics of the last closed window, pushed when a window closes
+        self._aggregator = aggregator
+        self._aggregates = {}
+        self._aggregate_children = []
+        # acceleration samples end up here instead of in entities
+        self._motion = motion
+        # values of signal telegrams, as attributes or as sub-entities
+        self._signal_children = []
+        self._attributes = CachedAttributes(
+            {}
+            if diagnostic_entities
+            else {
+                label: attrgetter(f"_{description.key}")
+                for label, description in MULTISENSOR_SIGNAL_DESCRIPTIONS.items()
+            }
+        )
 
         """Initialize the EnOcean thermostat sensor device."""
         super().__init__(dev_id, dev_name)
@@ -194,51 +535,125 @@ class EnOceanMultiSensor(EnOceanSensor, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return entity specific state attributes."""
-        return {
-            "energy status": self._energy_status,
-            "harvester delivery": self._harvester_delivery,
-            "backup energy": self._backup_energy
-        }
+        """Return entity specific state attributes, rebuilt only on changes."""
+        return self._attributes.get(self)
 
     def value_changed(self, packet):
 
-        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet.data)
+        _LOGGER.debug("[%s] incoming data: %s", self.dev_name, packet)
 
+        if self._standby:
+            self._deadband.force()
         self._standby = False
-        databits = to_bitarray(packet.data)
-
-        # check program type
-        program = (from_bitarray(databits[0:8]))
-        if (program == 0xd2):
-            self.handle_data_telegram(databits)
-
-            self.hass.services.call('custom_enocean', 'set_external_temperature', {
-                'entity_id': self._climate_id,
-                'temperature': self._temperature
-            })
-
-            _LOGGER.debug("External temperature set to %s for climate %s", self._temperature, self._climate_id)
 
-        elif (program == 0xd0):
-            self.handle_signal_telegram(databits)
-        else:
+        # look up the handler of the program type
+        handler = self._telegram_handlers.get(packet.rorg)
+        if handler is None:
             _LOGGER.error(
-                "[%s] unexpected program id: %s", self.dev_name, program)
+                "[%s] unexpected program id: %s", self.dev_name, packet.rorg)
+            return
 
-        self.schedule_update_ha_state()
+        if handler(self, packet.payload):
+            self.schedule_update_ha_state()
+
+    def _data_telegram_received(self, payload) -> bool:
+        """Handle a data telegram, return True if the state should be written."""
+        if not self.handle_data_telegram(payload):
+            return False
+
+        if self._climate_link is not None:
+            self._climate_link.async_update(self.hass, self._temperature)
+
+        if self._motion is not None:
+            for motion_type, data in self._motion.add(
+                self._accelelleration_x,
+                self._accelelleration_y,
+                self._accelelleration_z,
+                self._accelelleration_status,
+            ):
+                self.hass.bus.async_fire(
+                    EVENT_MOTION.format(motion_type),
+                    {"id": self.dev_id, "name": self.dev_name, **data},
+                )
+
+        if self._aggregator is not None and (
+            aggregates := self._aggregator.add({
+                "temperature": self._temperature,
+                "humidity": self._humidity,
+                "illumination": self._illumination,
+            })
+        ) is not None:
+            self._aggregates = aggregates
+            self._push_to_children(self._aggregate_children)
+
+        due = self._deadband.due({
+            "temperature": self._temperature,
+            "humidity": self._humidity,
+            "illumination": self._illumination,
+            "acceleration_x": self._accelelleration_x,
+            "acceleration_y": self._accelelleration_y,
+            "acceleration_z": self._accelelleration_z,
+        })
+        if not due:
+            return False
+        # values within their deadband keep their last written state
+        self._push_to_children(
+            [child for child in self._children if child._type in due], force=True
+        )
+        return True
+
+    def add_child(self, child):
+        """Push the values of future data telegrams to child."""
+        self._children.append(child)
+
+    def add_signal_child(self, child):
+        """Push the values of future signal telegrams to child."""
+        self._signal_children.append(child)
+
+    def add_aggregate_child(self, child):
+        """Push the statistics of future windows to child."""
+        self._aggregate_children.append(child)
+
+    def _push_to_children(self, children, force=False):
+        """Update sub-entities, write the changed ones in one batch.
+
+        With force all of them are written, e.g. after max_silence.
+        """
+        if changed := [child for child in children if child.update_value() or force]:
+            self._async_write_children(changed)
+
+    @callback
+    def _async_write_children(self, children):
+        coalescer = async_get_coalescer(self.hass)
+        for child in children:
+            coalescer.async_mark_dirty(child)
+
+    def _signal_telegram_received(self, payload) -> bool:
+        """Handle a signal telegram, these are rare and always written."""
+        self.handle_signal_telegram(payload)
+        self._push_to_children(self._signal_children)
+        return True
+
+    # program type (rorg) -> handler
+    _telegram_handlers = {
+        RORG_VLD: _data_telegram_received,
+        RORG_SIGNAL: _signal_telegram_received,
+    }
 
-    def handle_data_telegram(self, databits):
+    def handle_data_telegram(self, payload) -> bool:
         _LOGGER.debug("[%s] handle data telegram", self.dev_name)
 
         # extract properties
-        self._temperature = from_bitarray(databits[8:18]) * 0.1 - 40
-        self._humidity = from_bitarray(databits[18:26]) * 0.5
-        self._illumination = from_bitarray(databits[26:43])
-        self._accelelleration_status = from_bitarray(databits[43:45])
-        self._accelelleration_x = from_bitarray(databits[45:55]) * 0.005 - 2.5
-        self._accelelleration_y = from_bitarray(databits[55:65]) * 0.005 - 2.5
-        self._accelelleration_z = from_bitarray(databits[65:74]) * 0.005 - 2.5
+        if (values := MULTISENSOR_DATA_FIELDS.decode(payload)) is None:
+            _LOGGER.warning("[%s] data telegram too short: %s", self.dev_name, payload.hex())
+            return False
+        self._temperature = values["temperature"]
+        self._humidity = values["humidity"]
+        self._illumination = values["illumination"]
+        self._accelelleration_status = values["acceleration_status"]
+        self._accelelleration_x = values["acceleration_x"]
+        self._accelelleration_y = values["acceleration_y"]
+        self._accelelleration_z = values["acceleration_z"]
 
         _LOGGER.debug("[%s] temperature: %s", self.dev_name, self._temperature)
         _LOGGER.debug("[%s] humidity: %s", self.dev_name, self._humidity)
@@ -249,27 +664,35 @@ class EnOceanMultiSensor(EnOceanSensor, SensorEntity):
         _LOGGER.debug("[%s] acc-x: %s", self.dev_name, self._accelelleration_x)
         _LOGGER.debug("[%s] acc-y: %s", self.dev_name, self._accelelleration_y)
         _LOGGER.debug("[%s] acc-z: %s", self.dev_name, self._accelelleration_z)
+        return True
 
-    def handle_signal_telegram(self, databits):
+    def handle_signal_telegram(self, payload):
         _LOGGER.debug("[%s] handle signal telegram", self.dev_name)
 
-        signal_type = from_bitarray(databits[8:16])
+        # signal type and a byte of data, whole bytes need no bit fields
+        if not payload:
+            return
+        signal_type = payload[0]
+        data = payload[1] if len(payload) > 1 else 0
 
         # energy status
         if (signal_type == 0x06):
-            self._energy_status = from_bitarray(databits[16:24])
+            self._energy_status = data
         # energy delivery of harvester
         elif (signal_type == 0x0d):
-            self._harvester_delivery = from_bitarray(databits[16:24])
+            self._harvester_delivery = data
         # radio diabled
         elif (signal_type == 0x0e):
-            self._standby = true
+            self._standby = True
         # backup battery status
         elif (signal_type == 0x10):
-            self._backup_energy = from_bitarray(databits[16:24])
+            self._backup_energy = data
 
 
 class MultiSensorSubelement(SensorEntity):
+    """A value of a multisensor, pushed by the multisensor."""
+
+    _attr_should_poll = False
 
     def __init__(
         self,
@@ -285,29 +708,110 @@ class MultiSensorSubelement(SensorEntity):
         self._attr_name = f"{description.name} {dev_name}"
         self._attr_unique_id = description.unique_id(dev_id)
         self._type = type
+        # reads the value of the multisensor, e.g. _temperature
+        self._value_fn = attrgetter(f"_{type}")
         self.dev_id = dev_id
         self.dev_name = dev_name
 
+    def update_value(self) -> bool:
+        """Take the value from the multisensor, return True if it changed."""
+        value = self._value_fn(self.multisensor)
+        if value == self._attr_native_value:
+            return False
+        self._attr_native_value = value
+        return True
+
+
+class MultiSensorAggregate(MultiSensorSubelement):
+    """Min, max or mean of a value of a multisensor over a window."""
+
+    def __init__(
+        self,
+        multisensor,
+        dev_id,
+        dev_name,
+        type,
+        stat,
+        description: EnOceanSensorEntityDescription
+    ):
+        """Initialize the statistics sensor."""
+        super().__init__(multisensor, dev_id, dev_name, type, description)
+        self._attr_name = f"{description.name} {stat} {dev_name}"
+        self._attr_unique_id = f"{description.unique_id(dev_id)}-{stat}"
+        self._value_fn = lambda multisensor: multisensor._aggregates.get(type, {}).get(stat)
+
+
+class EnOceanEEPSensor(EnOceanSensor, SensorEntity):
+    """A value of a device described by the EEP registry."""
+
+    def __init__(self, dev_id, dev_name, profile, description):
+        """Initialize the sensor of one field of the profile."""
+        super().__init__(dev_id, dev_name)
+        self.entity_description = description
+        self._profile = profile
+        self._attr_name = f"{description.name} {dev_name}"
+        self._attr_unique_id = f"{combine_hex(dev_id)}-{description.key}"
+
+    def value_changed(self, packet):
+        """Update the value, teach-in telegrams are ignored."""
+        if packet.rorg != self._profile.rorg:
+            return
+        values = packet.decode(self._profile.layout)
+        if values is None or not values.get("data_telegram", True):
+            return
+        value = values[self.entity_description.key]
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.schedule_update_ha_state()
+
+
+class EnOceanLatencySensor(SensorEntity):
+    """Median latency of one stage of a dongle's pipeline.
+
+    Polled, the histogram itself is updated by the dongle.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = TIME_MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, usb_dongle, stage):
+        """Initialize the latency sensor."""
+        self._histogram = usb_dongle.latency.stages[stage]
+        self._attr_name = f"EnOcean {usb_dongle.identifier} {stage} latency"
+        self._attr_unique_id = f"{usb_dongle.identifier}-latency-{stage}"
+
     @property
     def native_value(self):
-        """Return value of sensor."""
-        if self._type == 'temperature':
-            return self.multisensor._temperature
-        elif self._type == 'humidity':
-            return self.multisensor._humidity
-        elif self._type == 'illumination':
-            return self.multisensor._illumination
+        """Return the median in milliseconds."""
+        return self._histogram.as_dict()["p50"]
+
+    @property
+    def extra_state_attributes(self):
+        """Return count and percentiles."""
+        return self._histogram.as_dict()
+
+
+class EnOceanDongleSensor(SensorEntity):
+    """Diagnostic counter of a dongle, polled."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: EnOceanDongleSensorEntityDescription
 
-        return ""
+    def __init__(self, usb_dongle, description: EnOceanDongleSensorEntityDescription):
+        """Initialize the dongle sensor."""
+        self._usb_dongle = usb_dongle
+        self.entity_description = description
+        self._attr_name = f"EnOcean {usb_dongle.identifier} {description.name}"
+        self._attr_unique_id = f"{usb_dongle.identifier}-{description.key}"
 
     @property
-    def native_unit_of_measurement(self):
-        """Get the unit of measurement."""
-        if self._type == 'temperature':
-            return "°C"
-        elif self._type == 'humidity':
-            return "%"
-        elif self._type == 'illumination':
-            return "lx"
-
-        return ""
+    def native_value(self):
+        """Return the current value."""
+        return self.entity_description.value_fn(self._usb_dongle)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the connection state."""
+        return {"connected": self._usb_dongle.connected}
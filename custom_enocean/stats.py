@@ -0,0 +1,92 @@
+"""Latency histograms of the receive and transmit path of a dongle."""
+from bisect import bisect_left
+
+# upper bounds of the histogram buckets in seconds, the last bucket is open
+BUCKETS = (
+    0.0001, 0.0002, 0.0005,
+    0.001, 0.002, 0.005,
+    0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5,
+    1.0, 2.0, 5.0,
+)
+
+# serial read -> frame parsed into a packet (asyncio transport)
+STAGE_PARSE = "parse"
+# packet parsed in the serial thread -> handled on the loop (threaded transport)
+STAGE_LOOP_HOP = "loop_hop"
+# packet parsed -> value_changed of the entity started
+STAGE_DISPATCH = "dispatch"
+# duration of value_changed
+STAGE_VALUE_CHANGED = "value_changed"
+# command queued -> written to the dongle
+STAGE_TRANSMIT = "transmit"
+# serial read of a telegram -> write of the response to it
+STAGE_REPLY = "reply"
+
+STAGES = (
+    STAGE_PARSE,
+    STAGE_LOOP_HOP,
+    STAGE_DISPATCH,
+    STAGE_VALUE_CHANGED,
+    STAGE_TRANSMIT,
+    STAGE_REPLY,
+)
+
+
+class LatencyHistogram:
+    """Counts of latencies in fixed buckets."""
+
+    __slots__ = ("counts", "count")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+
+    def record(self, seconds):
+        """Add a latency."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+
+    def percentile(self, fraction):
+        """Return the upper bound of the bucket holding the percentile, in seconds.
+
+        Latencies above the last bucket are reported as its bound.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return BUCKETS[-1]
+
+    def as_dict(self):
+        """Return count and percentiles in milliseconds."""
+        return {
+            "count": self.count,
+            **{
+                f"p{int(fraction * 100)}": None
+                if (value := self.percentile(fraction)) is None
+                else value * 1000
+                for fraction in (0.5, 0.9, 0.99)
+            },
+        }
+
+
+class LatencyStats:
+    """A histogram per stage."""
+
+    def __init__(self):
+        """Initialize the histograms."""
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+
+    def record(self, stage, seconds):
+        """Add the latency of a stage."""
+        self.stages[stage].record(seconds)
+
+    def as_dict(self):
+        """Return the percentiles of all stages."""
+        return {stage: histogram.as_dict() for stage, histogram in self.stages.items()}
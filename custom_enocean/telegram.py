@@ -0,0 +1,105 @@
+"""Compact representation of a received radio telegram."""
+
+
+class Telegram:
+    """An ERP1 radio telegram as handed to the entities.
+
+    Holds the radio data (rorg, payload, sender id, status) as one bytes
+    object, the fields are sliced out of it only when used. Replaces the
+    RadioPacket of python-enocean on the receive path.
+
+    >>> telegram = Telegram(bytes([0xA5, 0x32, 0xAA, 0x2C, 0x68, 5, 0x12, 0x34, 0x56, 0]), -64)
+    >>> hex(telegram.rorg), telegram.payload.hex(), hex(telegram.sender_int)
+    ('0xa5', '32aa2c68', '0x5123456')
+    >>> hex(telegram.value), telegram.data[:2]
+    ('0x32aa2c68', [165, 50])
+    """
+
+    __slots__ = (
+        "raw",
+        "sender_int",
+        "dBm",
+        "received_at",
+        "parsed_at",
+        "latency",
+        "replayed",
+        "_value",
+        "_data",
+        "_decoded",
+    )
+
+    def __init__(self, raw: bytes, dbm=None, sender_int=None):
+        """Initialize the telegram from the data of an ERP1 frame."""
+        self.raw = raw
+        # needed for routing anyway
+        self.sender_int = (
+            int.from_bytes(raw[-5:-1], "big") if sender_int is None else sender_int
+        )
+        self.dBm = dbm
+        self.received_at = None
+        self.parsed_at = None
+        self.latency = None
+        # read from a capture, replies to it are not sent
+        self.replayed = False
+        self._value = None
+        self._data = None
+        self._decoded = None
+
+    @classmethod
+    def from_frame(cls, frame, sender_int=None):
+        """Return the telegram of a received ESP3 frame."""
+        optional = frame.optional
+        # optional data: subtelegram count, destination id, dBm, security level
+        dbm = -optional[5] if len(optional) > 5 else None
+        return cls(bytes(frame.data), dbm, sender_int)
+
+    @classmethod
+    def from_packet(cls, packet):
+        """Return the telegram of a RadioPacket of python-enocean."""
+        return cls(bytes(packet.data), packet.dBm, packet.sender_int)
+
+    @property
+    def rorg(self) -> int:
+        """Return the radio telegram type."""
+        return self.raw[0]
+
+    @property
+    def payload(self) -> bytes:
+        """Return the user data without rorg, sender id and status."""
+        return self.raw[1:-5]
+
+    @property
+    def status(self) -> int:
+        """Return the status byte."""
+        return self.raw[-1]
+
+    @property
+    def value(self) -> int:
+        """Return the payload as one big-endian integer for bit-field decoding."""
+        if self._value is None:
+            self._value = int.from_bytes(self.raw[1:-5], "big")
+        return self._value
+
+    def decode(self, layout):
+        """Return the payload decoded with a BitFields layout.
+
+        The last result is kept, the entities of a device share it.
+        """
+        decoded = self._decoded
+        if decoded is None or decoded[0] is not layout:
+            decoded = self._decoded = (layout, layout.decode(self.raw[1:-5]))
+        return decoded[1]
+
+    @property
+    def data(self) -> list:
+        """Return the radio data as a list of ints, like RadioPacket.data."""
+        if self._data is None:
+            self._data = list(self.raw)
+        return self._data
+
+    def __repr__(self):
+        """Return the telegram for logging."""
+        return (
+            f"<Telegram {self.sender_int:08X} rorg={self.rorg:02X} "
+            f"payload={self.payload.hex()} status={self.status:02X} dBm={self.dBm}>"
+        )
@@ -0,0 +1,183 @@
+"""Prioritised and paced transmit queue of the EnOcean dongle."""
+import asyncio
+from heapq import heapify, heappop, heappush
+from itertools import count
+import logging
+from time import monotonic, perf_counter
+
+from homeassistant.core import callback
+
+from .const import PRIORITY_COMMAND
+from .stats import STAGE_REPLY, STAGE_TRANSMIT
+
+_LOGGER = logging.getLogger(__name__)
+
+# 868 MHz SRD band: a sender may use 1% of the airtime
+DUTY_CYCLE = 0.01
+# airtime that may be used at once, refilled at DUTY_CYCLE seconds per second
+AIRTIME_BURST = 1.0
+# ERP1 at 125 kbit/s, every telegram goes out as 3 subtelegrams
+BITRATE = 125000
+SUBTELEGRAMS = 3
+# preamble, sync, header and crc of a subtelegram in bytes (approximation)
+SUBTELEGRAM_OVERHEAD = 8
+# gap between two frames written to the dongle
+MIN_INTERVAL = 0.01
+MAX_QUEUE_LENGTH = 256
+
+
+def airtime(packet) -> float:
+    """Return the estimated airtime of a packet in seconds."""
+    return (len(packet.data) + SUBTELEGRAM_OVERHEAD) * 8 / BITRATE * SUBTELEGRAMS
+
+
+class TransmitQueue:
+    """Send packets by priority, drop them when their deadline passed.
+
+    Lower priority values are sent first, equal priorities in order of
+    arrival. A token bucket of airtime keeps the radio within its duty
+    cycle. A packet that fails to write is logged and dropped, the queue
+    goes on with the next one.
+
+    >>> from custom_enocean.stats import LatencyStats
+    >>> class Packet:
+    ...     def __init__(self, name):
+    ...         self.name, self.data = name, [0] * 10
+    >>> sent = []
+    >>> def write(packet):
+    ...     if packet.name == "broken":
+    ...         raise OSError("write failed")
+    ...     sent.append(packet.name)
+    >>> async def send(*names):
+    ...     queue = TransmitQueue(write, LatencyStats())
+    ...     queue.async_start(asyncio.get_running_loop())
+    ...     for name in names:
+    ...         queue.async_put(Packet(name))
+    ...     await asyncio.sleep(0.1)
+    ...     queue.async_stop()
+    ...     return queue.write_errors
+    >>> asyncio.run(send("broken", "next"))
+    1
+    >>> sent
+    ['next']
+    """
+
+    def __init__(self, write, latency, maxlen=MAX_QUEUE_LENGTH):
+        """Initialize the queue, write is called with each packet to send."""
+        self._write = write
+        self._latency = latency
+        self._maxlen = maxlen
+        self._heap = []
+        self._seq = count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._paused = False
+        self._budget = AIRTIME_BURST
+        self._refilled = monotonic()
+        # metrics
+        self.sent = 0
+        self.deadline_misses = 0
+        self.overflows = 0
+        self.max_depth = 0
+        self.write_errors = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued packets."""
+        return len(self._heap)
+
+    def as_dict(self):
+        """Return the counters, for logging."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "deadline_misses": self.deadline_misses,
+            "overflows": self.overflows,
+            "write_errors": self.write_errors,
+        }
+
+    @callback
+    def async_start(self, loop):
+        """Start sending."""
+        self._task = loop.create_task(self._async_run())
+
+    @callback
+    def async_stop(self):
+        """Stop sending, queued packets are kept."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_pause(self):
+        """Hold all packets, e.g. while the dongle is disconnected."""
+        self._paused = True
+
+    @callback
+    def async_resume(self):
+        """Send the held packets that are still valid."""
+        self._paused = False
+        self._wakeup.set()
+
+    @callback
+    def async_put(self, packet, priority=PRIORITY_COMMAND, max_age=None):
+        """Queue a packet, drop it if it could not be sent within max_age seconds."""
+        deadline = None if max_age is None else monotonic() + max_age
+        packet.queued_at = perf_counter()
+        heappush(self._heap, (priority, next(self._seq), deadline, packet))
+        if len(self._heap) > self._maxlen:
+            # drop the newest packet of the lowest priority
+            dropped = max(self._heap, key=lambda entry: entry[:2])
+            self._heap.remove(dropped)
+            heapify(self._heap)
+            self.overflows += 1
+            _LOGGER.warning("Transmit queue full, dropped: %s", dropped[3])
+        self.max_depth = max(self.max_depth, len(self._heap))
+        self._wakeup.set()
+
+    def _refill(self, now):
+        self._budget = min(
+            AIRTIME_BURST, self._budget + (now - self._refilled) * DUTY_CYCLE
+        )
+        self._refilled = now
+
+    async def _async_run(self):
+        while True:
+            if self._paused or not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, _, deadline, packet = self._heap[0]
+            now = monotonic()
+            if deadline is not None and now > deadline:
+                heappop(self._heap)
+                self.deadline_misses += 1
+                _LOGGER.debug("Dropped stale packet: %s", packet)
+                continue
+
+            self._refill(now)
+            cost = airtime(packet)
+            if self._budget < cost:
+                # re-check afterwards, a more urgent packet may have arrived
+                await asyncio.sleep((cost - self._budget) / DUTY_CYCLE)
+                continue
+
+            heappop(self._heap)
+            self._budget -= cost
+            try:
+                self._write(packet)
+            except Exception:  # pylint: disable=broad-except
+                # a dead task would never send again
+                self.write_errors += 1
+                _LOGGER.exception("Sending failed, dropped: %s", packet)
+                await asyncio.sleep(MIN_INTERVAL)
+                continue
+            self.sent += 1
+            written_at = perf_counter()
+            self._latency.record(STAGE_TRANSMIT, written_at - packet.queued_at)
+            # set by the entity for responses to a received telegram
+            if (received_at := getattr(packet, "received_at", None)) is not None:
+                self._latency.record(STAGE_REPLY, written_at - received_at)
+            await asyncio.sleep(MIN_INTERVAL)